@@ -0,0 +1,212 @@
+"""
+Benchmarks for play's game loop.
+
+Every scenario is run headless (see PLAY_HEADLESS in the README) at several sprite
+counts, each in its own Python process so scenarios can't affect each other.
+Results are printed as one JSON object per line, so runs from different commits
+can be saved and compared:
+
+    python benchmarks/run.py > before.jsonl
+    python benchmarks/run.py --scenarios static_boxes rotating_images --sizes 100 1000 --frames 300
+
+Each result has:
+
+    scenario, n                 which scenario and how many sprites/handlers it used
+    fps                         frames per second (drawing included, no frame rate limit)
+    frame_ms                    p50/p95/p99 frame times in milliseconds
+    phases_ms                   p50 time of each part of the frame (see play.profiler)
+    alloc_kb_per_frame          average peak of new Python memory allocated in a frame, in KB
+                                (left out before Python 3.9, which can't reset tracemalloc's peak)
+    traced_memory_kb            Python memory in use after the run, in KB
+    max_rss_mb                  the most memory the process used, in MB
+                                (left out on Windows, which doesn't have the resource module)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_FRAMES = 200
+WARMUP_FRAMES = 30
+ALLOCATION_FRAMES = 30
+
+
+def static_boxes(play, n):
+    for i in range(n):
+        play.new_box(color='red', x=play.random_number(-390, 390), y=play.random_number(-290, 290), width=10, height=10)
+
+def rotating_images(play, n):
+    images = [play.new_image(x=play.random_number(-390, 390), y=play.random_number(-290, 290), size=20) for i in range(n)]
+    def each_frame():
+        for image in images:
+            image.turn(3)
+    return each_frame
+
+def physics_circles(play, n):
+    for i in range(n):
+        circle = play.new_circle(radius=5, x=play.random_number(-390, 390), y=play.random_number(-290, 290))
+        circle.start_physics(bounciness=0.2)
+
+def changing_text(play, n):
+    labels = [play.new_text('0', x=play.random_number(-390, 390), y=play.random_number(-290, 290), font_size=20) for i in range(n)]
+    frame = [0]
+    def each_frame():
+        frame[0] += 1
+        for i, label in enumerate(labels):
+            label.words = str(frame[0] + i)
+    return each_frame
+
+def changing_glyph_text(play, n):
+    labels = [play.new_text('0', x=play.random_number(-390, 390), y=play.random_number(-290, 290), font_size=20, glyph_atlas=True) for i in range(n)]
+    frame = [0]
+    def each_frame():
+        frame[0] += 1
+        for i, label in enumerate(labels):
+            label.words = str(frame[0] + i)
+    return each_frame
+
+def key_handlers(play, n):
+    import pygame
+    keys = 'abcdefghijklmnopqrstuvwxyz'
+    for i in range(n):
+        @play.when_key_pressed(keys[i % len(keys)])
+        def handler(key):
+            pass
+    def each_frame():
+        for key in (pygame.K_a, pygame.K_m, pygame.K_z):
+            name = pygame.key.name(key)
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=name, scancode=0))
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=name, scancode=0))
+    return each_frame
+
+def particles(play, n):
+    import numpy
+    numpy.random.seed(0)
+    sparks = play.new_particles('orange', count=n, radius=3)
+    sparks.x_speed = numpy.random.uniform(-3, 3, n)
+    sparks.y_speed = numpy.random.uniform(0, 6, n)
+    sparks.turn_speed = 5
+    sparks.gravity = 0.1
+    sparks.fade_speed = 1
+    def each_frame():
+        faded = sparks.transparency <= 0
+        sparks.x[faded] = 0
+        sparks.y[faded] = 0
+        sparks.transparency[faded] = 100
+    return each_frame
+
+SCENARIOS = {
+    'static_boxes': static_boxes,
+    'rotating_images': rotating_images,
+    'physics_circles': physics_circles,
+    'changing_text': changing_text,
+    'changing_glyph_text': changing_glyph_text,
+    'key_handlers': key_handlers,
+    'particles': particles,
+}
+
+
+def run_child(scenario, n, frames):
+    """
+    Set up one scenario, run it and print its result. Runs in its own process.
+    """
+    import random
+    import tracemalloc
+    try:
+        import resource
+    except ImportError: # not available on Windows
+        resource = None
+
+    random.seed(0)
+    os.environ['PLAY_HEADLESS'] = '1'
+    sys.path.insert(0, ROOT)
+    import play
+    from play import play as play_internals
+
+    each_frame = SCENARIOS[scenario](play, n)
+
+    # tracemalloc.reset_peak() is needed to measure each frame separately
+    measure_allocations = hasattr(tracemalloc, 'reset_peak')
+    total_frames = WARMUP_FRAMES + frames + (ALLOCATION_FRAMES if measure_allocations else 0)
+    state = {'frame': 0, 'start': None, 'end': None, 'peaks': [], 'traced': 0}
+
+    @play.repeat_forever
+    def measure():
+        state['frame'] += 1
+        frame = state['frame']
+        if each_frame:
+            each_frame()
+
+        if frame == WARMUP_FRAMES:
+            play.profiler.start(frames=frames)
+            state['start'] = time.perf_counter()
+        elif frame == WARMUP_FRAMES + frames:
+            state['end'] = time.perf_counter()
+            play.profiler.stop()
+            tracemalloc.start()
+            state['traced'] = 0
+        elif frame > WARMUP_FRAMES + frames and measure_allocations:
+            # tracemalloc makes everything slower, so allocations are measured after timing
+            current, peak = tracemalloc.get_traced_memory()
+            state['peaks'].append(peak - state['traced'])
+            tracemalloc.reset_peak()
+            state['traced'] = tracemalloc.get_traced_memory()[0]
+        if frame >= total_frames:
+            play_internals._loop.stop()
+
+    play.start_program()
+
+    report = play.profiler.report()
+    result = {
+        'scenario': scenario,
+        'n': n,
+        'frames': frames,
+        'fps': round(frames / (state['end'] - state['start']), 2),
+        'frame_ms': {name: round(value, 3) for name, value in report.pop('frame').items()},
+        'phases_ms': {phase: round(timings['p50'], 3) for phase, timings in report.items()},
+        'traced_memory_kb': round(tracemalloc.get_traced_memory()[0] / 1024, 1),
+    }
+    if resource:
+        # ru_maxrss is in bytes on macOS but in KB on Linux
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            max_rss_kb /= 1024
+        result['max_rss_mb'] = round(max_rss_kb / 1024, 1)
+    if measure_allocations:
+        result['alloc_kb_per_frame'] = round(sum(state['peaks']) / max(len(state['peaks']), 1) / 1024, 1)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark play's game loop.")
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='sprite/handler counts to try')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help='frames to time for each run')
+    parser.add_argument('--child', nargs=2, metavar=('SCENARIO', 'N'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]), args.frames)
+        return
+
+    for scenario in args.scenarios:
+        for n in args.sizes:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--frames', str(args.frames), '--child', scenario, str(n)],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            lines = [line for line in completed.stdout.splitlines() if line.startswith('{')]
+            if completed.returncode != 0 or not lines:
+                print(json.dumps({'scenario': scenario, 'n': n, 'error': completed.stderr.strip().splitlines()[-1:]}))
+            else:
+                print(lines[-1])
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import os
+import weakref
+from collections import OrderedDict
+
+
+def surface_size_in_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache(object):
+    """
+    A least-recently-used cache of pygame surfaces that never holds more than
+    `max_bytes` of pixel data.
+
+    Every cached surface is made from a "source" surface (e.g. a sprite's primary
+    surface) plus a key describing what was done to it. The cache only keeps a
+    weak reference to each source, and everything made from a source is thrown
+    away as soon as that source is garbage collected.
+
+    Surfaces handed out by the cache are shared, so they must never be drawn on.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict() # (id(source), key) -> (surface, size in bytes)
+        self._sources = {} # id(source) -> (weak reference to source, set of keys made from it)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, source, key):
+        full_key = (id(source), key)
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(full_key)
+        return entry[0]
+
+    def put(self, source, key, surface):
+        size = surface_size_in_bytes(surface)
+        if size > self.max_bytes:
+            # caching this would push everything else out
+            return
+
+        source_id = id(source)
+        full_key = (source_id, key)
+        if full_key in self._entries:
+            self._remove(full_key)
+
+        if source_id not in self._sources:
+            self._sources[source_id] = (weakref.ref(source, lambda ref: self._forget_source(source_id)), set())
+        self._sources[source_id][1].add(key)
+
+        self._entries[full_key] = (surface, size)
+        self.used_bytes += size
+        self._shrink_to(self.max_bytes)
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._shrink_to(max_bytes)
+
+    def clear(self):
+        self._entries.clear()
+        self._sources.clear()
+        self.used_bytes = 0
+
+    def _forget_source(self, source_id):
+        ref, keys = self._sources.pop(source_id, (None, ()))
+        for key in keys:
+            entry = self._entries.pop((source_id, key), None)
+            if entry:
+                self.used_bytes -= entry[1]
+
+    def _remove(self, full_key):
+        surface, size = self._entries.pop(full_key)
+        self.used_bytes -= size
+        source_id, key = full_key
+        keys = self._sources[source_id][1]
+        keys.discard(key)
+        if not keys:
+            del self._sources[source_id]
+
+    def _shrink_to(self, max_bytes):
+        while self.used_bytes > max_bytes and self._entries:
+            full_key = next(iter(self._entries))
+            self._remove(full_key)
+
+
+class ImageCache(object):
+    """
+    Loads each image file once and shares the loaded surface between everything
+    that uses it.
+
+    Images are keyed by their real path and modification time, so changing a file
+    on disk loads it again. Every acquire() must be matched by a release() with the
+    key it returned; an image is forgotten as soon as nothing is using it.
+
+    Surfaces handed out by the cache are shared, so they must never be drawn on.
+    """
+    def __init__(self, load):
+        self._load = load # function that takes a path and returns a surface
+        self._images = {} # (path, mtime) -> [surface, number of users]
+
+    def __len__(self):
+        return len(self._images)
+
+    def acquire(self, filename):
+        path = os.path.realpath(filename)
+        key = (path, os.path.getmtime(path))
+
+        image = self._images.get(key)
+        if image is None:
+            image = self._images[key] = [self._load(path), 0]
+        image[1] += 1
+        return key, image[0]
+
+    def release(self, key):
+        image = self._images.get(key)
+        if image is None:
+            return
+        image[1] -= 1
+        if image[1] <= 0:
+            del self._images[key]
@@ -3,19 +3,34 @@ import logging as _logging
 import warnings as _warnings
 import inspect as _inspect
 
+# Set the PLAY_HEADLESS environment variable (e.g. PLAY_HEADLESS=1) to run without a window,
+# e.g. on servers or in tests. Pygame still draws everything, just to a screen nobody can see.
+_headless = _os.environ.get('PLAY_HEADLESS', '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+if _headless:
+    # SDL's dummy drivers let pygame make a screen and play sounds without a real display or sound card
+    _os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    _os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
 import pygame
-pygame.init()
 import pygame.gfxdraw
-import pymunk as _pymunk
+_pymunk = None # pymunk takes a while to load, so it's imported by _init() when it's first needed
+_numpy = None # only needed for particles, so it's imported when the first particles are made
 
 import asyncio as _asyncio
 import random as _random
 import math as _math
+import time as _time
+import itertools as _itertools
+import bisect as _bisect
+import weakref as _weakref
 from statistics import mean as _mean
 
 from .keypress import pygame_key_to_name as _pygame_key_to_name # don't pollute user-facing namespace with library internals
-from .color import color_name_to_rgb as _color_name_to_rgb
+from .color import color_name_to_rgb as _color_name_to_rgb, color_names as _color_names
 from .exceptions import Oops, Hmm
+from .cache import SurfaceCache as _SurfaceCache, ImageCache as _ImageCache
+from .spatial import SpatialHash as _SpatialHash
+from . import profiler as _profiler # importing it also makes play.profiler available to users
 
 def _clamp(num, min_, max_):
     if num < min_:
@@ -24,16 +39,83 @@ def _clamp(num, min_, max_):
         return max_
     return num
 
+_collision_mode = 'box' # see set_collision_mode()
+
+# which pixels of a sprite can be seen, for set_collision_mode('precise'). Masks are made from
+# a sprite's secondary surface the first time they're needed and forgotten with the surface,
+# so sprites that share a surface (like coins turned to the same angle) share a mask too
+_masks = _weakref.WeakKeyDictionary()
+def _mask(sprite):
+    surface = sprite._secondary_pygame_surface
+    mask = _masks.get(surface)
+    if mask is None:
+        mask = _masks[surface] = pygame.mask.from_surface(_unfaded_secondary_surface(sprite))
+    return mask
+
+def _unfaded_secondary_surface(sprite):
+    # from_surface() skips pixels that are mostly see-through, so faded sprites would hardly have
+    # any pixels to touch. Masks are made from the same picture without the fading instead
+    key = sprite._secondary_key
+    if key is None or key[2] == 100:
+        return sprite._secondary_pygame_surface
+    angle, size, transparency = key
+    if angle == 0 and size == 100:
+        return sprite._primary_pygame_surface
+    unfaded_key = (angle, size, 100)
+    surface = _transform_cache.get(sprite._primary_pygame_surface, unfaded_key)
+    if surface is None:
+        surface = _transform_surface(sprite._primary_pygame_surface, angle, size, 100)
+        _transform_cache.put(sprite._primary_pygame_surface, unfaded_key, surface)
+    return surface
+
+def _drawn_box(sprite):
+    # left, top, width and height of the sprite's picture. This can be different from
+    # sprite.left, sprite.width, etc., e.g. for boxes that are turned
+    width, height = sprite._secondary_pygame_surface.get_size()
+    return sprite.x - width/2., sprite.y + height/2., width, height
+
+def _index_box(sprite):
+    # the area _spatial_index keeps a sprite in: its box, plus any part of its picture
+    # that sticks out of it (e.g. the corners of a turned box)
+    left, top, width, height = _drawn_box(sprite)
+    return min(sprite.left, left), min(sprite.bottom, top - height), max(sprite.right, left + width), max(sprite.top, top)
+
 def _point_touching_sprite(point, sprite):
-    # todo: custom code for circle, line, rotated rectangley sprites
-    return sprite.left <= point.x <= sprite.right and sprite.bottom <= point.y <= sprite.top
+    # todo: custom code for lines
+    if _collision_mode == 'box' or isinstance(sprite, line):
+        return sprite.left <= point.x <= sprite.right and sprite.bottom <= point.y <= sprite.top
+
+    # the box around the sprite's picture is checked first because it's quick
+    left, top, width, height = _drawn_box(sprite)
+    x, y = _math.floor(point.x - left), _math.floor(top - point.y)
+    if not (0 <= x < width and 0 <= y < height):
+        return False
+    return bool(_mask(sprite).get_at((x, y)))
+
+def _shapes_touching(a, b):
+    # shapes are normally only moved to match their bodies during a physics step, so update them first
+    if not a.cache_bb().intersects(b.cache_bb()):
+        return False
+    return bool(a.shapes_collide(b).points)
 
 def _sprite_touching_sprite(a, b):
-    # todo: custom code for circle, line, rotated rectangley sprites
-    # use physics engine if both sprites have physics on
-    # if a.physics and b.physics:
-    if a.left >= b.right or a.right <= b.left or a.top <= b.bottom or a.bottom >= b.top: return False
-    return True
+    # use physics engine if both sprites have physics on (line shapes don't always sit where the
+    # line is drawn, though, so lines use the box check below)
+    if a.physics and b.physics and not (isinstance(a, line) or isinstance(b, line)):
+        return _shapes_touching(a.physics._pymunk_shape, b.physics._pymunk_shape)
+    # todo: custom code for lines
+    if _collision_mode == 'box' or isinstance(a, line) or isinstance(b, line):
+        if a.left >= b.right or a.right <= b.left or a.top <= b.bottom or a.bottom >= b.top: return False
+        return True
+
+    # the boxes around the sprites' pictures are checked first because it's quick
+    a_left, a_top, a_width, a_height = _drawn_box(a)
+    b_left, b_top, b_width, b_height = _drawn_box(b)
+    if a_left >= b_left + b_width or a_left + a_width <= b_left or a_top <= b_top - b_height or a_top - a_height >= b_top:
+        return False
+    # where b's top-left corner is compared to a's
+    offset = (round(b_left - a_left), round(a_top - b_top))
+    return _mask(a).overlap(_mask(b), offset) is not None
 
 
 
@@ -41,6 +123,10 @@ class _screen(object):
     def __init__(self, width=800, height=600):
         self._width = width
         self._height = height
+        # where (0, 0) is in pygame's coordinates. Used for every sprite every frame, so it's
+        # only worked out when the screen size changes
+        self._half_width = width/2.
+        self._half_height = height/2.
 
     @property 
     def width(self):
@@ -48,11 +134,13 @@ class _screen(object):
     @width.setter
     def width(self, _width):
         self._width = _width
+        self._half_width = _width/2.
 
-        _remove_walls()
-        _create_walls()
+        if _initialized:
+            _remove_walls()
+            _create_walls()
 
-        pygame.display.set_mode((self._width, self._height))
+            pygame.display.set_mode((self._width, self._height))
 
     @property 
     def height(self):
@@ -60,11 +148,13 @@ class _screen(object):
     @height.setter
     def height(self, _height):
         self._height = _height
+        self._half_height = _height/2.
 
-        _remove_walls()
-        _create_walls()
+        if _initialized:
+            _remove_walls()
+            _create_walls()
 
-        pygame.display.set_mode((self._width, self._height))
+            pygame.display.set_mode((self._width, self._height))
 
     @property 
     def top(self):
@@ -84,15 +174,48 @@ class _screen(object):
 
 screen = _screen()
 
-# _pygame_display = pygame.display.set_mode((screen_width, screen_height), pygame.DOUBLEBUF | pygame.OPENGL)
-_pygame_display = pygame.display.set_mode((screen.width, screen.height), pygame.DOUBLEBUF)
-pygame.display.set_caption("Python Play")
+_initialized = False
+_pygame_display = None
+def _init():
+    """
+    Open the window and set up everything needed to run the program. This happens when
+    the first sprite is made or the program starts instead of when play is imported, so
+    just importing play is fast and doesn't open a window.
+    """
+    global _initialized, _pygame_display, _pymunk, _loop
+    if _initialized:
+        return
+    _initialized = True
+
+    # only start the parts of pygame we use (e.g. not sound or joysticks)
+    pygame.display.init()
+    pygame.font.init()
+
+    # _pygame_display = pygame.display.set_mode((screen_width, screen_height), pygame.DOUBLEBUF | pygame.OPENGL)
+    _pygame_display = pygame.display.set_mode((screen.width, screen.height), pygame.DOUBLEBUF)
+    pygame.display.set_caption("Python Play")
+
+    pygame.key.set_repeat(200, 16)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION])
+
+    import pymunk as _pymunk
+    _create_physics_space()
+
+    _loop = _asyncio.get_event_loop()
+    _loop.set_debug(False)
+
+    _warnings.showwarning = _showwarning
+    # by default Python only shows a warning once per line of code, but every forgotten 'await' should raise Oops
+    _warnings.filterwarnings('always', message="coroutine '.*' was never awaited", category=RuntimeWarning)
 
 
 class _mouse(object):
     def __init__(self):
         self.x = 0
         self.y = 0
+        # where the mouse is on the screen (with 0, 0 in the middle). x and y are where it is in the world
+        self._screen_x = 0
+        self._screen_y = 0
         self._is_clicked = False
         self._when_clicked_callbacks = []
         self._when_click_released_callbacks = []
@@ -150,9 +273,186 @@ def when_click_released(func):
 
 mouse = _mouse()
 
+class _camera(object):
+    """
+    Which part of the world is shown on the screen. Sprites are placed in the world,
+    and the camera decides where they end up on the screen:
+
+        @play.repeat_forever
+        def do():
+            play.camera.go_to(player) # keep the player in the middle of the screen
+
+        play.camera.zoom = 200 # make everything look twice as big
+
+    play.mouse.x and play.mouse.y are always positions in the world.
+    """
+    def __init__(self):
+        self._x = 0
+        self._y = 0
+        self._zoom = 100
+
+    @property
+    def x(self):
+        return self._x
+    @x.setter
+    def x(self, _x):
+        self._x = _x
+
+    @property
+    def y(self):
+        return self._y
+    @y.setter
+    def y(self, _y):
+        self._y = _y
+
+    @property
+    def zoom(self):
+        return self._zoom
+    @zoom.setter
+    def zoom(self, percent):
+        if not percent > 0:
+            raise Oops(f"""The camera's zoom has to be more than 0, but it's being set to {percent}.
+Use 100 for normal size, bigger numbers to zoom in and smaller numbers to zoom out.""")
+        self._zoom = percent
+
+    def go_to(self, x=None, y=None):
+        try:
+            # e.g. play.camera.go_to(sprite)
+            self.x = x.x
+            self.y = x.y
+        except AttributeError:
+            self.x = x
+            self.y = y
+
+    # the edges of the screen in world positions
+    @property
+    def left(self):
+        return self._x - screen._half_width * 100. / self._zoom
+
+    @property
+    def right(self):
+        return self._x + screen._half_width * 100. / self._zoom
+
+    @property
+    def top(self):
+        return self._y + screen._half_height * 100. / self._zoom
+
+    @property
+    def bottom(self):
+        return self._y - screen._half_height * 100. / self._zoom
+
+    def _state(self):
+        # if this changes, everything on the screen is somewhere else
+        return (self._x, self._y, self._zoom, screen._width, screen._height)
+
+camera = _camera()
+
 
 all_sprites = []
 
+# every sprite's bounding box, so we can find sprites near a point or area without checking every sprite
+_spatial_index = _SpatialHash(cell_size=100)
+_sprite_numbers = _itertools.count()
+_back_numbers = _itertools.count(-1, -1) # for sprite.send_to_back()
+
+# every sprite in the order it's drawn: sorted by layer, then by when it was made (or
+# brought to the front or sent to the back). _render_keys has each sprite's
+# (layer, number) so sprites can be found and put in the right place with bisect
+_render_order = []
+_render_keys = []
+
+def _add_sprite(sprite):
+    sprite._sprite_number = next(_sprite_numbers) # used to put sprites found with _spatial_index back in order
+    all_sprites.append(sprite)
+    _spatial_index.insert(sprite, *_index_box(sprite))
+    sprite._render_key = (sprite._layer, sprite._sprite_number)
+    _insert_in_render_order(sprite)
+
+def _insert_in_render_order(sprite):
+    index = _bisect.bisect(_render_keys, sprite._render_key)
+    _render_keys.insert(index, sprite._render_key)
+    _render_order.insert(index, sprite)
+    _layer_changed(sprite._layer)
+
+def _remove_from_render_order(sprite):
+    """
+    Returns False if the sprite wasn't in the render order (e.g. it was removed).
+    """
+    index = _bisect.bisect_left(_render_keys, sprite._render_key)
+    if index >= len(_render_order) or _render_order[index] is not sprite:
+        return False
+    del _render_keys[index]
+    del _render_order[index]
+    _layer_changed(sprite._layer)
+    return True
+
+class _CachedLayer(object):
+    """
+    All the sprites in a layer drawn onto one screen-sized surface, which is then
+    drawn at the top-left corner of the screen (see play.cache_layer()).
+    """
+    _render_key = None
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.sprites = [] # the layer's visible sprites, found again every frame
+        self._secondary_pygame_surface = None # None means it needs to be drawn again
+        self.camera = None # the camera's _state() when it was drawn
+
+    def _redraw(self):
+        surface = pygame.Surface(_pygame_display.get_size(), pygame.SRCALPHA)
+        _draw_sprites(self.sprites, surface)
+        self._secondary_pygame_surface = surface
+        self.camera = camera._state()
+
+_cached_layers = {} # layer -> _CachedLayer
+
+def _layer_changed(layer):
+    # called whenever a sprite in a layer moves, changes, appears or disappears
+    if _cached_layers:
+        cached_layer = _cached_layers.get(layer)
+        if cached_layer:
+            cached_layer._secondary_pygame_surface = None
+
+def cache_layer(layer, cached=True):
+    """
+    Draw all the sprites in a layer onto one picture and reuse that picture every frame.
+    This is much faster for layers with lots of sprites that hardly ever change, like backgrounds:
+
+        for x in range(-400, 400, 20):
+            tile = play.new_image('grass.png', x=x, y=-280)
+            tile.layer = -1 # behind everything else
+        play.cache_layer(-1)
+
+    The picture is drawn again whenever a sprite in the layer moves or changes, so caching
+    doesn't help layers that change every frame. Use `play.cache_layer(-1, cached=False)` to stop.
+    """
+    if cached:
+        if layer not in _cached_layers:
+            _cached_layers[layer] = _CachedLayer(layer)
+    else:
+        _cached_layers.pop(layer, None)
+
+def sprites_in_rect(left=None, right=None, top=None, bottom=None):
+    """
+    Returns a list of all the sprites touching an area. Any side that isn't given
+    is the edge of the screen, wherever the camera has moved it, e.g.:
+
+        # all sprites in the left half of the screen
+        sprites = play.sprites_in_rect(right=play.camera.x)
+    """
+    left = camera.left if left is None else left
+    right = camera.right if right is None else right
+    top = camera.top if top is None else top
+    bottom = camera.bottom if bottom is None else bottom
+
+    found = [
+        sprite for sprite in _spatial_index.query(left, bottom, right, top)
+        if not (sprite.left >= right or sprite.right <= left or sprite.top <= bottom or sprite.bottom >= top)
+    ]
+    found.sort(key=lambda sprite: sprite._sprite_number)
+    return found
+
 _debug = True
 def debug(on_or_off):
     global _debug
@@ -228,22 +528,53 @@ def random_position():
         random_number(screen.bottom, screen.top)
     )
 
+# "coroutine '...' was never awaited" warnings, collected as they happen for the task whose
+# callback made them. Python only warns about these when the coroutine is thrown away, which
+# is always before the callback that made it finishes, so each callback just has to check its
+# own list after it runs instead of recording every warning while it runs.
+_unawaited_coroutine_warnings = {} # asyncio task -> list of warnings
+_original_showwarning = _warnings.showwarning
+
+def _current_task():
+    try:
+        return _asyncio.current_task()
+    except RuntimeError:
+        return None # not running inside the event loop
+
+def _showwarning(message, category, filename, lineno, file=None, line=None):
+    if issubclass(category, RuntimeWarning) and 'was never awaited' in str(message):
+        task_warnings = _unawaited_coroutine_warnings.get(_current_task())
+        if task_warnings is not None:
+            task_warnings.append((str(message), filename, lineno))
+            return
+    _original_showwarning(message, category, filename, lineno, file, line)
+
 def _raise_on_await_warning(func):
     """
     If someone doesn't put 'await' before functions that require 'await'
     like play.timer() or play.animate(), raise an exception.
     """
     async def f(*args, **kwargs):
-        with _warnings.catch_warnings(record=True) as w:
-            await func(*args, **kwargs)
-            for warning in w:
-                str_message = warning.message.args[0] # e.g. "coroutine 'timer' was never awaited"
-                if 'was never awaited' in str_message:
-                    unawaited_function_name = str_message.split("'")[1]
-                    raise Oops(f"""Looks like you forgot to put "await" before play.{unawaited_function_name} on line {warning.lineno} of file {warning.filename}.
-To fix this, just add the word 'await' before play.{unawaited_function_name} on line {warning.lineno} of file {warning.filename} in the function {func.__name__}.""")
-                else:
-                    print(warning.message)
+        task = _current_task()
+        outer_warnings = _unawaited_coroutine_warnings.get(task) # if this callback was called by another one
+        task_warnings = _unawaited_coroutine_warnings[task] = []
+        try:
+            if _profiler.running:
+                await _profiler.timed_steps('tasks', func(*args, **kwargs))
+            else:
+                await func(*args, **kwargs)
+        finally:
+            if outer_warnings is None:
+                del _unawaited_coroutine_warnings[task]
+            else:
+                _unawaited_coroutine_warnings[task] = outer_warnings
+            # the Oops below keeps this frame alive, which mustn't keep the task alive too
+            task = None
+        if task_warnings:
+            str_message, filename, lineno = task_warnings[0] # e.g. "coroutine 'timer' was never awaited"
+            unawaited_function_name = str_message.split("'")[1]
+            raise Oops(f"""Looks like you forgot to put "await" before play.{unawaited_function_name} on line {lineno} of file {filename}.
+To fix this, just add the word 'await' before play.{unawaited_function_name} on line {lineno} of file {filename} in the function {func.__name__}.""")
     return f
 
 def _make_async(func):
@@ -390,10 +721,155 @@ class Group(metaclass=_MetaGroup):
 def new_group(*sprites):
     return Group(*sprites)
 
+_transform_cache = _SurfaceCache(max_bytes=64 * 1024 * 1024)
+_transform_cache_angle_step = 1
+def _transform_cache_angle(angle):
+    if not _transform_cache_angle_step:
+        return angle
+    return (round(angle / _transform_cache_angle_step) * _transform_cache_angle_step) % 360
+
+def set_transform_cache(megabytes=64, angle_step=1):
+    """
+    Turned, sized and faded sprites are remembered so the same picture doesn't have to be
+    made over and over again, e.g. when lots of coins are spinning at the same speed.
+
+        play.set_transform_cache(megabytes=64, angle_step=1)
+
+    `megabytes` is the most memory the remembered pictures can take up. `angle_step` rounds
+    sprite angles to the nearest number of degrees before turning them, so that sprites at
+    almost the same angle can share a picture. Set it to 0 to always use exact angles.
+    """
+    global _transform_cache_angle_step
+    if megabytes < 0 or angle_step < 0:
+        raise Oops(f"""play.set_transform_cache() needs numbers that are 0 or more, but got megabytes={megabytes} and angle_step={angle_step}.""")
+    _transform_cache_angle_step = angle_step
+    _transform_cache.resize(int(megabytes * 1024 * 1024))
+    _transform_cache.clear() # pictures made with the old angle_step shouldn't be reused
+
+_display_format = {'surface': None}
+def _new_surface(size):
+    """
+    Make a see-through surface that's in the same pixel format as the screen, so drawing
+    it on the screen later doesn't have to convert every pixel first.
+    """
+    return pygame.Surface(size, pygame.SRCALPHA, _display_format_surface())
+
+def _in_display_format(surface):
+    # converting makes a copy, so only do it when the surface isn't in the right format already
+    if surface.get_masks() == _display_format_surface().get_masks():
+        return surface
+    return surface.convert_alpha()
+
+def _display_format_surface():
+    if _display_format['surface'] is None:
+        _display_format['surface'] = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    return _display_format['surface']
+
+# sprites whose images have to be made again before they're drawn. It's a dict used as a set
+# that remembers order, so when there's a time budget the sprites that waited longest go first
+_surfaces_to_recompute = {}
+_surface_budget = {'seconds': None}
+
+def set_surface_budget(milliseconds=None):
+    """
+    Limit how long each frame can spend re-making sprite images after they change (their
+    color, words, size, angle, etc.). Sprites that don't fit in a frame are re-made in the
+    next frames instead, so changing lots of sprites at once doesn't make one frame really slow:
+
+        play.set_surface_budget(milliseconds=4)
+
+    At least one sprite is always re-made every frame. Use play.set_surface_budget() (or
+    milliseconds=None) to re-make every changed sprite right away, which is the default.
+    """
+    if milliseconds is not None and milliseconds < 0:
+        raise Oops(f"""play.set_surface_budget() needs a number of milliseconds that's 0 or more, but got {milliseconds}.""")
+    _surface_budget['seconds'] = None if milliseconds is None else milliseconds / 1000.
+
+def _recompute_surfaces():
+    # re-make the images of sprites that changed since the last frame, all in one go before drawing
+    if not _surfaces_to_recompute:
+        return
+    budget = _surface_budget['seconds']
+    deadline = None if budget is None else _time.perf_counter() + budget
+    for sprite in list(_surfaces_to_recompute):
+        if sprite._is_hidden:
+            continue # hidden sprites wait until they're shown again
+        del _surfaces_to_recompute[sprite]
+        if sprite._should_recompute_primary_surface:
+            # recomputing primary surface also recomputes secondary surface
+            sprite._compute_primary_surface()
+        elif sprite._should_recompute_secondary_surface:
+            sprite._compute_secondary_surface()
+        if deadline is not None and _time.perf_counter() > deadline:
+            break
+
+def _transform_surface(surface, angle, size, transparency):
+    """
+    Returns a copy of `surface` that's scaled, turned and faded. Used for sprites and particles.
+    """
+    original = surface
+
+    # scale
+    if size != 100:
+        ratio = size/100.
+        surface = pygame.transform.scale(
+            surface,
+            (round(surface.get_width() * ratio),    # width
+             round(surface.get_height() * ratio)))  # height
+
+    # transparency
+    if transparency != 100:
+        if surface is original:
+            surface = surface.copy()
+        alpha = _clamp(round((transparency/100.) * 255), 0, 255)
+        if surface.get_flags() & pygame.SRCALPHA:
+            # for text and images with transparent pixels, multiply every pixel's alpha in one go
+            surface.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            # this works for images without alpha pixels in them
+            surface.set_alpha(alpha)
+
+    # rotate (after fading, so the corners it adds match the image's transparent color)
+    if angle != 0:
+        surface = pygame.transform.rotate(surface, angle)
+
+    # scaling, fading and turning all make a new surface, so the original only has to be copied if none happened
+    if surface is original:
+        surface = surface.copy()
+
+    return surface
+
 def new_image(image=None, x=0, y=0, size=100, angle=0, transparency=100):
     return Sprite(image=image, x=x, y=y, size=size, angle=angle, transparency=transparency)
 
+def _load_image(path):
+    surface = pygame.image.load(path)
+    # convert once to the screen's pixel format so drawing the image later is fast
+    surface.set_colorkey((255,255,255, 255)) # set background to transparent
+    if surface.get_flags() & pygame.SRCALPHA:
+        # converting turns the color key into see-through pixels, so turning the image later
+        # doesn't fill its new corners with the color key
+        surface = surface.convert_alpha()
+    else:
+        surface = surface.convert()
+    return surface
+
+_image_cache = _ImageCache(_load_image)
+
 class Sprite(object):
+    _image_key = None # which _image_cache entry this sprite is using, if any
+    _collision_type = 0 # the sprite's pymunk collision type, only given to sprites with touch callbacks
+    _secondary_key = None # (angle, size, transparency) the secondary surface was made with, None if it's the primary surface
+    _layer = 0
+    # how far from x and y to draw the sprite so physics movement looks smooth (see set_physics_rate)
+    _interpolation_x = 0
+    _interpolation_y = 0
+
+    def __new__(cls, *args, **kwargs):
+        # the window opens when the first sprite is made
+        _init()
+        return super().__new__(cls)
+
     def __init__(self, image=None, x=0, y=0, size=100, angle=0, transparency=100):
         self._image = image or _os.path.join(_os.path.split(__file__)[0], 'blank_image.png')
         self._x = x
@@ -411,16 +887,18 @@ class Sprite(object):
 
         self._when_clicked_callbacks = []
 
-        all_sprites.append(self)
+        _add_sprite(self)
 
 
     def _compute_primary_surface(self):
+        # sprites using the same image file share one read-only primary surface
+        previous_image_key = self._image_key
         try:
-            self._primary_pygame_surface = pygame.image.load(_os.path.join(self._image))
-        except pygame.error as exc:
+            self._image_key, self._primary_pygame_surface = _image_cache.acquire(self._image)
+        except (pygame.error, OSError) as exc:
             raise Oops(f"""We couldn't find the image file you provided named "{self._image}".
 If the file is in a folder, make sure you add the folder name, too.""") from exc
-        self._primary_pygame_surface.set_colorkey((255,255,255, 255)) # set background to transparent
+        _image_cache.release(previous_image_key)
 
         self._should_recompute_primary_surface = False
 
@@ -428,35 +906,37 @@ If the file is in a folder, make sure you add the folder name, too.""") from exc
         self._compute_secondary_surface(force=True)
 
     def _compute_secondary_surface(self, force=False):
+        # sprites that share a primary surface (e.g. clones of the same image) and are turned,
+        # sized and faded the same way get the exact same secondary surface from the cache
+        angle = _transform_cache_angle(self._angle)
+        if angle == 0 and self._size == 100 and self._transparency == 100:
+            # nothing to change, so draw the primary surface itself (it's never drawn on)
+            surface = self._primary_pygame_surface
+            key = None
+        else:
+            key = (angle, self._size, self._transparency)
+            surface = _transform_cache.get(self._primary_pygame_surface, key)
+            if surface is None:
+                surface = self._transform_primary_surface(angle)
+                _transform_cache.put(self._primary_pygame_surface, key, surface)
+        self._secondary_pygame_surface = surface
+        self._secondary_key = key
 
-        self._secondary_pygame_surface = self._primary_pygame_surface.copy()
-
-        # transparency
-        if self._transparency != 100 or force:
-            try:
-                # for text and images with transparent pixels
-                array = pygame.surfarray.pixels_alpha(self._secondary_pygame_surface)
-                array[:, :] = (array[:, :] * (self._transparency/100.)).astype(array.dtype) # modify surface pixels in-place
-                del array # I think pixels are written when array leaves memory, so delete it explicitly here
-            except Exception as e:
-                # this works for images without alpha pixels in them
-                self._secondary_pygame_surface.set_alpha(round((self._transparency/100.) * 255))
-
-        # scale
-        if (self.size != 100) or force:
-            ratio = self.size/100.
-            self._secondary_pygame_surface = pygame.transform.scale(
-                self._secondary_pygame_surface,
-                (round(self._secondary_pygame_surface.get_width() * ratio),    # width
-                 round(self._secondary_pygame_surface.get_height() * ratio)))  # height
-
+        self._should_recompute_secondary_surface = False
+        self._changed()
 
-        # rotate
-        if (self.angle != 0) or force:
-            self._secondary_pygame_surface = pygame.transform.rotate(self._secondary_pygame_surface, self._angle)
+    def _invalidate_primary(self):
+        # the sprite's image has to be made again before it's drawn
+        self._should_recompute_primary_surface = True
+        _surfaces_to_recompute[self] = None
 
+    def _invalidate_secondary(self):
+        # the sprite has to be turned, sized or faded again before it's drawn
+        self._should_recompute_secondary_surface = True
+        _surfaces_to_recompute[self] = None
 
-        self._should_recompute_secondary_surface = False
+    def _transform_primary_surface(self, angle):
+        return _transform_surface(self._primary_pygame_surface, angle, self.size, self._transparency)
 
     @property
     def is_clicked(self):
@@ -483,7 +963,8 @@ If the file is in a folder, make sure you add the folder name, too.""") from exc
                 # setting velocity makes the simulation more realistic usually
                 self.physics._pymunk_body.velocity = _x - prev_x, self.physics._pymunk_body.velocity.y
             if self.physics._pymunk_body.body_type == _pymunk.Body.STATIC:
-                _physics_space.reindex_static()
+                _moved_static_bodies.add(self.physics._pymunk_body)
+        self._changed()
 
     @property 
     def y(self):
@@ -498,7 +979,8 @@ If the file is in a folder, make sure you add the folder name, too.""") from exc
                 # setting velocity makes the simulation more realistic usually
                 self.physics._pymunk_body.velocity = self.physics._pymunk_body.velocity.x, _y - prev_y
             if self.physics._pymunk_body.body_type == _pymunk.Body.STATIC:
-                _physics_space.reindex_static()
+                _moved_static_bodies.add(self.physics._pymunk_body)
+        self._changed()
 
     @property 
     def transparency(self):
@@ -516,7 +998,7 @@ You might want to look in your code where you're setting transparency and make s
 
 
         self._transparency = _clamp(alpha, 0, 100)
-        self._should_recompute_secondary_surface = True
+        self._invalidate_secondary()
 
     @property 
     def image(self):
@@ -525,7 +1007,7 @@ You might want to look in your code where you're setting transparency and make s
     @image.setter
     def image(self, image_filename):
         self._image = image_filename
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     @property 
     def angle(self):
@@ -534,7 +1016,7 @@ You might want to look in your code where you're setting transparency and make s
     @angle.setter
     def angle(self, _angle):
         self._angle = _angle
-        self._should_recompute_secondary_surface = True
+        self._invalidate_secondary()
 
         if self.physics:
             self.physics._pymunk_body.angle = _math.radians(_angle)
@@ -546,18 +1028,20 @@ You might want to look in your code where you're setting transparency and make s
     @size.setter
     def size(self, percent):
         self._size = percent
-        self._should_recompute_secondary_surface = True
+        self._invalidate_secondary()
         if self.physics:
             self.physics._remove()
             self.physics._make_pymunk()
 
     def hide(self):
         self._is_hidden = True
+        _layer_changed(self._layer)
         if self.physics:
             self.physics.pause()
 
     def show(self):
         self._is_hidden = False
+        _layer_changed(self._layer)
         if self.physics:
             self.physics.unpause()
 
@@ -568,6 +1052,7 @@ You might want to look in your code where you're setting transparency and make s
     @is_hidden.setter
     def is_hidden(self, hide):
         self._is_hidden = hide
+        _layer_changed(self._layer)
 
     @property
     def is_shown(self):
@@ -576,6 +1061,38 @@ You might want to look in your code where you're setting transparency and make s
     @is_shown.setter
     def is_shown(self, show):
         self._is_hidden = not show
+        _layer_changed(self._layer)
+
+    @property
+    def layer(self):
+        return self._layer
+
+    @layer.setter
+    def layer(self, _layer):
+        self._set_render_key((_layer, self._render_key[1]))
+
+    # sprite.z is another name for sprite.layer
+    z = layer
+
+    def bring_to_front(self):
+        """
+        Draw this sprite in front of the other sprites in its layer.
+        """
+        self._set_render_key((self._layer, next(_sprite_numbers)))
+
+    def send_to_back(self):
+        """
+        Draw this sprite behind the other sprites in its layer.
+        """
+        self._set_render_key((self._layer, next(_back_numbers)))
+
+    def _set_render_key(self, render_key):
+        # only sprites that haven't been removed are put back in the render order
+        in_render_order = _remove_from_render_order(self)
+        self._layer = render_key[0]
+        self._render_key = render_key
+        if in_render_order:
+            _insert_in_render_order(self)
 
     def is_touching(self, sprite_or_point):
         rect = self._secondary_pygame_surface.get_rect()
@@ -584,6 +1101,29 @@ You might want to look in your code where you're setting transparency and make s
         else:
             return _point_touching_sprite(sprite_or_point, self)
 
+    def touching_sprites(self):
+        """
+        Returns a list of all the other sprites this sprite is touching.
+
+        Example:
+
+            @play.repeat_forever
+            def do():
+                for sprite in player.touching_sprites():
+                    sprite.hide()
+        """
+        found = [
+            sprite for sprite in _spatial_index.query(*_index_box(self))
+            if sprite is not self and _sprite_touching_sprite(sprite, self)
+        ]
+        found.sort(key=lambda sprite: sprite._sprite_number)
+        return found
+
+    def _changed(self):
+        # called whenever the sprite moves or looks different
+        _spatial_index.move(self, *_index_box(self))
+        _layer_changed(self._layer)
+
     def point_towards(self, x, y=None):
         try:
             x, y = x.x, x.y
@@ -634,6 +1174,12 @@ You might want to look in your code where you're setting transparency and make s
         if self.physics:
             self.physics._remove()
         all_sprites.remove(self)
+        _spatial_index.remove(self)
+        _remove_from_render_order(self)
+        _clickable_sprites.discard(self)
+        _surfaces_to_recompute.pop(self, None)
+        _image_cache.release(self._image_key)
+        self._image_key = None
 
     @property 
     def width(self):
@@ -671,11 +1217,28 @@ You might want to look in your code where you're setting transparency and make s
     def bottom(self, y):
         self.y = y + self.height/2
 
-    def _pygame_x(self):
-        return self.x + (screen.width/2.) - (self._secondary_pygame_surface.get_width()/2.)
-
-    def _pygame_y(self):
-        return (screen.height/2.) - self.y - (self._secondary_pygame_surface.get_height()/2.)
+    def _screen_surface(self):
+        # what the sprite looks like on the screen, which is bigger or smaller when the camera is zoomed
+        if camera._zoom == 100:
+            return self._secondary_pygame_surface
+        angle = _transform_cache_angle(self._angle)
+        size = self._size * camera._zoom / 100.
+        key = (angle, size, self._transparency)
+        surface = _transform_cache.get(self._primary_pygame_surface, key)
+        if surface is None:
+            surface = _transform_surface(self._primary_pygame_surface, angle, size, self._transparency)
+            _transform_cache.put(self._primary_pygame_surface, key, surface)
+        return surface
+
+    def _pygame_x(self, surface=None):
+        if surface is None:
+            surface = self._screen_surface()
+        return screen._half_width + (self.x + self._interpolation_x - camera._x) * camera._zoom / 100. - (surface.get_width()/2.)
+
+    def _pygame_y(self, surface=None):
+        if surface is None:
+            surface = self._screen_surface()
+        return screen._half_height - (self.y + self._interpolation_y - camera._y) * camera._zoom / 100. - (surface.get_height()/2.)
 
     # @decorator
     def when_clicked(self, callback, call_with_sprite=False):
@@ -689,15 +1252,33 @@ You might want to look in your code where you're setting transparency and make s
             wrapper.is_running = False
         wrapper.is_running = False
         self._when_clicked_callbacks.append(wrapper)
+        _clickable_sprites.add(self)
         return wrapper
 
+    # @decorator
+    def when_touching(self, other):
+        """
+        Run a function when this sprite starts touching another sprite. Both sprites need to
+        have physics turned on (see start_physics()):
+
+            @ball.when_touching(paddle)
+            def do():
+                ball.color = play.random_color()
+        """
+        return when_sprites_touch(self, other)
+
     def _common_properties(self):
         # used with inheritance to clone
         return {'x': self.x, 'y': self.y, 'size': self.size, 'transparency': self.transparency, 'angle': self.angle}
 
     def clone(self):
         # TODO: make work with physics
-        return self.__class__(image=self.image, **self._common_properties())
+        return self._finish_clone(self.__class__(image=self.image, **self._common_properties()))
+
+    def _finish_clone(self, clone):
+        # copy the properties that can't be given when making a sprite
+        clone.layer = self.layer
+        return clone
 
     # def __getattr__(self, key):
     #     # TODO: use physics as a proxy object so users can do e.g. sprite.x_speed
@@ -730,6 +1311,47 @@ You might want to look in your code where you're setting transparency and make s
     def stop_physics(self):
         self.physics._remove()
         self.physics = None
+        self._interpolation_x = self._interpolation_y = 0
+
+# sprites with physics that can move, which are the only ones that need updating after each physics step
+_physics_sprites = set()
+
+# static bodies that were moved since the last physics step. pymunk only has to be told where their
+# shapes are now once before the next step, no matter how many times they moved
+_moved_static_bodies = set()
+
+# every sprite with a touch callback gets its own pymunk collision type, so that pymunk can tell
+# us when two of them start touching instead of checking every pair of sprites every frame
+_collision_types = _itertools.count(1)
+_touch_callbacks = {} # (collision type, collision type) -> callbacks
+_touches_this_frame = set() # keys of _touch_callbacks for sprites that started touching since the last frame
+
+def _add_touch_callback(a, b, func):
+    async_callback = _make_async(func)
+    async def wrapper():
+        wrapper.is_running = True
+        await async_callback()
+        wrapper.is_running = False
+    wrapper.is_running = False
+
+    for sprite in (a, b):
+        if not sprite._collision_type:
+            sprite._collision_type = next(_collision_types)
+            if sprite.physics:
+                sprite.physics._pymunk_shape.collision_type = sprite._collision_type
+
+    key = tuple(sorted((a._collision_type, b._collision_type)))
+    if key not in _touch_callbacks:
+        _touch_callbacks[key] = []
+        # called by pymunk during a physics step, when nothing can be added to or removed from
+        # the physics space, so the callbacks are started later by the game loop
+        handler = _physics_space.add_collision_handler(*key)
+        def begin(arbiter, space, data):
+            _touches_this_frame.add(key)
+            return True # let the sprites bounce off each other like normal
+        handler.begin = begin
+    _touch_callbacks[key].append(wrapper)
+    return wrapper
 
 _SPEED_MULTIPLIER = 10
 class _Physics(object):
@@ -769,6 +1391,7 @@ class _Physics(object):
 
     def _make_pymunk(self):
         mass = self.mass if self.can_move else 0
+        self.sprite._interpolation_x = self.sprite._interpolation_y = 0
 
         # non-moving line shapes are platforms and it's easier to take care of them less-generically
         if not self.can_move and isinstance(self.sprite, line):
@@ -817,7 +1440,10 @@ class _Physics(object):
 
         self._pymunk_shape.elasticity = _clamp(self.bounciness, 0, .99)
         self._pymunk_shape.friction = self._friction
+        self._pymunk_shape.collision_type = self.sprite._collision_type
         _physics_space.add(self._pymunk_body, self._pymunk_shape)
+        if self.can_move:
+            _physics_sprites.add(self.sprite)
 
 
     def clone(self, sprite):
@@ -830,7 +1456,11 @@ class _Physics(object):
     def unpause(self):
         if not self._pymunk_body and not self._pymunk_shape:
             _physics_space.add(self._pymunk_body, self._pymunk_shape)
+            if self.can_move:
+                _physics_sprites.add(self.sprite)
     def _remove(self):
+        _physics_sprites.discard(self.sprite)
+        _moved_static_bodies.discard(self._pymunk_body)
         if self._pymunk_body:
             _physics_space.remove(self._pymunk_body)
         if self._pymunk_shape:
@@ -907,10 +1537,14 @@ class _Gravity(object):
     horizontal = 0
 
 gravity = _Gravity()
-_physics_space = _pymunk.Space()
-_physics_space.sleep_time_threshold = 0.5 
-_physics_space.idle_speed_threshold = 0 # pymunk estimates good threshold based on gravity
-_physics_space.gravity = gravity.horizontal, gravity.vertical
+_physics_space = None # made by _init()
+def _create_physics_space():
+    global _physics_space
+    _physics_space = _pymunk.Space()
+    _physics_space.sleep_time_threshold = 0.5 
+    _physics_space.idle_speed_threshold = 0 # pymunk estimates good threshold based on gravity
+    _physics_space.gravity = gravity.horizontal, gravity.vertical
+    _create_walls()
 
 def set_gravity(vertical=-100, horizontal=None):
     global gravity
@@ -918,7 +1552,8 @@ def set_gravity(vertical=-100, horizontal=None):
     if horizontal != None:
         gravity.horizontal = horizontal*_SPEED_MULTIPLIER
 
-    _physics_space.gravity = gravity.horizontal, gravity.vertical
+    if _physics_space:
+        _physics_space.gravity = gravity.horizontal, gravity.vertical
 
 def _create_wall(a, b):
     segment = _pymunk.Segment(_physics_space.static_body, a, b, 0.0)
@@ -927,16 +1562,34 @@ def _create_wall(a, b):
     _physics_space.add(segment)
     return segment
 _walls = []
+_world_bounds = {'left': None, 'right': None, 'top': None, 'bottom': None} # None means the edge of the screen
 def _create_walls():
-    _walls.append(_create_wall([screen.left, screen.top], [screen.right, screen.top])) # top
-    _walls.append(_create_wall([screen.left, screen.bottom], [screen.right, screen.bottom])) # bottom
-    _walls.append(_create_wall([screen.left, screen.bottom], [screen.left, screen.top])) # left
-    _walls.append(_create_wall([screen.right, screen.bottom], [screen.right, screen.top])) # right
-_create_walls()
+    left = screen.left if _world_bounds['left'] is None else _world_bounds['left']
+    right = screen.right if _world_bounds['right'] is None else _world_bounds['right']
+    top = screen.top if _world_bounds['top'] is None else _world_bounds['top']
+    bottom = screen.bottom if _world_bounds['bottom'] is None else _world_bounds['bottom']
+    _walls.append(_create_wall([left, top], [right, top])) # top
+    _walls.append(_create_wall([left, bottom], [right, bottom])) # bottom
+    _walls.append(_create_wall([left, bottom], [left, top])) # left
+    _walls.append(_create_wall([right, bottom], [right, top])) # right
 def _remove_walls():
     _physics_space.remove(_walls)
     _walls.clear()
 
+def set_world_bounds(left=None, right=None, top=None, bottom=None):
+    """
+    Move the walls that keep physics sprites in, e.g. for a level that's bigger than the screen:
+
+        play.set_world_bounds(left=-2000, right=2000)
+
+    Any side that isn't given stays at the edge of the screen. Use play.camera to
+    show different parts of the world.
+    """
+    _world_bounds.update(left=left, right=right, top=top, bottom=bottom)
+    if _physics_space:
+        _remove_walls()
+        _create_walls()
+
 def new_box(color='black', x=0, y=0, width=100, height=200, border_color='light blue', border_width=0, angle=0, transparency=100, size=100):
     return Box(color=color, x=x, y=y, width=width, height=height, border_color=border_color, border_width=border_width, angle=angle, transparency=transparency, size=size)
 
@@ -961,10 +1614,10 @@ class Box(Sprite):
 
         self._compute_primary_surface()
 
-        all_sprites.append(self)
+        _add_sprite(self)
 
     def _compute_primary_surface(self):
-        self._primary_pygame_surface = pygame.Surface((self._width, self._height), pygame.SRCALPHA)
+        self._primary_pygame_surface = _new_surface((self._width, self._height))
 
 
         if self._border_width and self._border_color:
@@ -988,7 +1641,7 @@ class Box(Sprite):
     @width.setter
     def width(self, _width):
         self._width = _width
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
 
     ##### height #####
@@ -999,7 +1652,7 @@ class Box(Sprite):
     @height.setter
     def height(self, _height):
         self._height = _height
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
 
     ##### color #####
@@ -1010,7 +1663,7 @@ class Box(Sprite):
     @color.setter
     def color(self, _color):
         self._color = _color
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### border_color #####
     @property 
@@ -1020,7 +1673,7 @@ class Box(Sprite):
     @border_color.setter
     def border_color(self, _border_color):
         self._border_color = _border_color
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### border_width #####
     @property 
@@ -1030,10 +1683,10 @@ class Box(Sprite):
     @border_width.setter
     def border_width(self, _border_width):
         self._border_width = _border_width
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     def clone(self):
-        return self.__class__(color=self.color, width=self.width, height=self.height, border_color=self.border_color, border_width=self.border_width, **self._common_properties())
+        return self._finish_clone(self.__class__(color=self.color, width=self.width, height=self.height, border_color=self.border_color, border_width=self.border_width, **self._common_properties()))
 
 def new_circle(color='black', x=0, y=0, radius=100, border_color='light blue', border_width=0, transparency=100, size=100, angle=0):
     return Circle(color=color, x=x, y=y, radius=radius, border_color=border_color, border_width=border_width,
@@ -1059,14 +1712,14 @@ class Circle(Sprite):
 
         self._compute_primary_surface()
 
-        all_sprites.append(self)
+        _add_sprite(self)
 
     def clone(self):
-        return self.__class__(color=self.color, radius=self.radius, border_color=self.border_color, border_width=self.border_width, **self._common_properties())
+        return self._finish_clone(self.__class__(color=self.color, radius=self.radius, border_color=self.border_color, border_width=self.border_width, **self._common_properties()))
 
     def _compute_primary_surface(self):
         total_diameter = (self._radius + self._border_width) * 2
-        self._primary_pygame_surface = pygame.Surface((total_diameter, total_diameter), pygame.SRCALPHA)
+        self._primary_pygame_surface = _new_surface((total_diameter, total_diameter))
 
 
         center = self._radius + self._border_width
@@ -1090,7 +1743,7 @@ class Circle(Sprite):
     @color.setter
     def color(self, _color):
         self._color = _color
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### radius #####
     @property 
@@ -1100,7 +1753,7 @@ class Circle(Sprite):
     @radius.setter
     def radius(self, _radius):
         self._radius = _radius
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
         if self.physics:
             self.physics._pymunk_shape.unsafe_set_radius(self._radius)
 
@@ -1112,7 +1765,7 @@ class Circle(Sprite):
     @border_color.setter
     def border_color(self, _border_color):
         self._border_color = _border_color
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### border_width #####
     @property 
@@ -1122,7 +1775,7 @@ class Circle(Sprite):
     @border_width.setter
     def border_width(self, _border_width):
         self._border_width = _border_width
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
 def new_line(color='black', x=0, y=0, length=None, angle=None, thickness=1, x1=None, y1=None, transparency=100, size=100):
     return line(color=color, x=x, y=y, length=length, angle=angle, thickness=thickness, x1=x1, y1=y1, transparency=transparency, size=size)
@@ -1159,10 +1812,10 @@ class line(Sprite):
 
         self._compute_primary_surface()
 
-        all_sprites.append(self)
+        _add_sprite(self)
 
     def clone(self):
-        return self.__class__(color=self.color, length=self.length, thickness=self.thickness, **self._common_properties())
+        return self._finish_clone(self.__class__(color=self.color, length=self.length, thickness=self.thickness, **self._common_properties()))
 
     def _compute_primary_surface(self):
         # Make a surface that just contains the line and no white-space around the line.
@@ -1192,6 +1845,7 @@ class line(Sprite):
             self._secondary_pygame_surface.set_alpha(round((self._transparency/100.) * 255))
 
         self._should_recompute_secondary_surface = False
+        self._changed()
 
     ##### color #####
     @property 
@@ -1201,7 +1855,7 @@ class line(Sprite):
     @color.setter
     def color(self, _color):
         self._color = _color
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### thickness #####
     @property 
@@ -1211,7 +1865,7 @@ class line(Sprite):
     @thickness.setter
     def thickness(self, _thickness):
         self._thickness = _thickness
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     def _calc_endpoint(self):
         radians = _math.radians(self._angle)
@@ -1226,7 +1880,7 @@ class line(Sprite):
     def length(self, _length):
         self._length = _length
         self._x1, self._y1 = self._calc_endpoint()
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### angle #####
     @property 
@@ -1239,6 +1893,7 @@ class line(Sprite):
         self._x1, self._y1 = self._calc_endpoint()
         if self.physics:
             self.physics._pymunk_body.angle = _math.radians(_angle)
+        self._changed()
 
 
     def _calc_length_angle(self):
@@ -1257,7 +1912,7 @@ class line(Sprite):
     def x1(self, _x1):
         self._x1 = _x1
         self._length, self._angle = self._calc_length_angle()
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     ##### y1 #####
     @property 
@@ -1268,14 +1923,116 @@ class line(Sprite):
     def y1(self, _y1):
         self._angle = _y1
         self._length, self._angle = self._calc_length_angle()
-        self._should_recompute_primary_surface = True
-
-def new_text(words='hi :)', x=0, y=0, font=None, font_size=50, color='black', angle=0, transparency=100, size=100):
-    return text(words=words, x=x, y=y, font=font, font_size=font_size, color=color, angle=angle, transparency=transparency, size=size)
+        self._invalidate_primary()
+
+_fonts = {} # (font file, font size) -> pygame.font.Font
+def _get_font(font, font_size):
+    # loading a font file is slow, so each font is only loaded once for each size
+    key = (font, font_size)
+    pygame_font = _fonts.get(key)
+    if pygame_font is None:
+        try:
+            pygame_font = pygame.font.Font(font, font_size)
+        except:
+            _warnings.warn(f"""We couldn't find the font file '{font}'. We'll use the default font instead for now.
+To fix this, either set the font to None, or make sure you have a font file (usually called something like Arial.ttf) in your project folder.\n""", Hmm)
+            pygame_font = pygame.font.Font(None, font_size)
+        _fonts[key] = pygame_font
+    return pygame_font
+
+# text that was drawn recently, shared by every text sprite, so e.g. a score that goes back and
+# forth between a few numbers or lots of labels with the same words are only drawn once
+_rendered_text = _SurfaceCache(max_bytes=16 * 1024 * 1024)
+def _render_text(pygame_font, words, color, antialias=True):
+    rgb = _color_name_to_rgb(color)
+    key = (words, rgb, antialias)
+    surface = _rendered_text.get(pygame_font, key)
+    if surface is None:
+        surface = _in_display_format(pygame_font.render(words, antialias, rgb))
+        _rendered_text.put(pygame_font, key, surface)
+    return surface
+
+class _GlyphAtlas(object):
+    """
+    Every character of one font in one color, each drawn once onto a shared surface,
+    so words can be put together by copying characters instead of drawing the whole string.
+    """
+    WIDTH = 1024
+
+    def __init__(self, pygame_font, rgb, antialias):
+        self._pygame_font = pygame_font
+        self._rgb = rgb
+        self._antialias = antialias
+        # some characters come out a little taller than the font's height, so leave room for them
+        self.height = max(pygame_font.get_linesize(), pygame_font.get_height() + 2)
+        self.surface = _new_surface((self.WIDTH, self.height))
+        self._glyphs = {} # character -> where it is on self.surface
+        self._next_x = 0
+        self._next_y = 0
+
+    def glyph(self, character):
+        rect = self._glyphs.get(character)
+        if rect is None:
+            rendered = self._pygame_font.render(character, self._antialias, self._rgb)
+            width = min(rendered.get_width(), self.WIDTH)
+            if self._next_x + width > self.WIDTH:
+                # start a new row
+                self._next_x = 0
+                self._next_y += self.height
+            if self._next_y + self.height > self.surface.get_height():
+                # out of room, so make the atlas twice as tall
+                bigger = _new_surface((self.WIDTH, self.surface.get_height() * 2))
+                bigger.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                self.surface = bigger
+            rect = pygame.Rect(self._next_x, self._next_y, width, min(rendered.get_height(), self.height))
+            # BLEND_RGBA_MAX onto empty pixels copies the pixels exactly instead of blending them
+            self.surface.blit(rendered, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self._glyphs[character] = rect
+            self._next_x += width
+        return rect
+
+_glyph_atlases = {} # (pygame font, rgb, antialias) -> _GlyphAtlas
+def _render_text_from_glyphs(pygame_font, words, color, buffer=None, antialias=True):
+    """
+    Put words together from a glyph atlas. The words are drawn onto `buffer` if it's big enough,
+    so nothing new has to be made. Returns (surface with the words on it, buffer).
+    """
+    rgb = _color_name_to_rgb(color)
+    key = (pygame_font, rgb, antialias)
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = _glyph_atlases[key] = _GlyphAtlas(pygame_font, rgb, antialias)
+
+    blits = []
+    x = 0
+    height = 1
+    for character in words:
+        rect = atlas.glyph(character)
+        blits.append((rect, (x, 0)))
+        x += rect.width
+        height = max(height, rect.height)
+    width = max(x, 1)
+    if buffer is None or buffer.get_width() < width or buffer.get_height() < height:
+        # leave some room so words that get a little longer still fit
+        buffer = _new_surface((width * 2, atlas.height))
+
+    area = pygame.Rect(0, 0, width, height)
+    buffer.fill((0, 0, 0, 0), area)
+    # the atlas might have grown while adding new characters, so only look at its surface now
+    atlas_surface = atlas.surface
+    buffer.blits([(atlas_surface, position, rect, pygame.BLEND_RGBA_MAX) for rect, position in blits], doreturn=False)
+    # a new subsurface every time, so anything holding on to the last one can tell the words changed
+    return buffer.subsurface(area), buffer
+
+def new_text(words='hi :)', x=0, y=0, font=None, font_size=50, color='black', angle=0, transparency=100, size=100, glyph_atlas=False):
+    return text(words=words, x=x, y=y, font=font, font_size=font_size, color=color, angle=angle, transparency=transparency, size=size, glyph_atlas=glyph_atlas)
 
 class text(Sprite):
-    def __init__(self, words='hi :)', x=0, y=0, font=None, font_size=50, color='black', angle=0, transparency=100, size=100):
+    _glyph_buffer = None # where words are put together when glyph_atlas is on
+
+    def __init__(self, words='hi :)', x=0, y=0, font=None, font_size=50, color='black', angle=0, transparency=100, size=100, glyph_atlas=False):
         self._words = words
+        self._glyph_atlas = glyph_atlas
         self._x = x
         self._y = y
         self._font = font
@@ -1293,25 +2050,41 @@ class text(Sprite):
 
         self._when_clicked_callbacks = []
 
-        all_sprites.append(self)
+        _add_sprite(self)
 
     def clone(self):
-        return self.__class__(words=self.words, font=self.font, font_size=self.font_size, color=self.color, **self._common_properties())
+        return self._finish_clone(self.__class__(words=self.words, font=self.font, font_size=self.font_size, color=self.color, glyph_atlas=self.glyph_atlas, **self._common_properties()))
 
     def _compute_primary_surface(self):
-        try:
-            self._pygame_font = pygame.font.Font(self._font, self._font_size)
-        except:
-            _warnings.warn(f"""We couldn't find the font file '{self._font}'. We'll use the default font instead for now.
-To fix this, either set the font to None, or make sure you have a font file (usually called something like Arial.ttf) in your project folder.\n""", Hmm)
-            self._pygame_font = pygame.font.Font(None, self._font_size)
-
-        self._primary_pygame_surface = self._pygame_font.render(self._words, True, _color_name_to_rgb(self._color))
+        self._pygame_font = _get_font(self._font, self._font_size)
+        if self._glyph_atlas:
+            self._primary_pygame_surface, self._glyph_buffer = _render_text_from_glyphs(
+                self._pygame_font, self._words, self._color, self._glyph_buffer)
+        else:
+            self._primary_pygame_surface = _render_text(self._pygame_font, self._words, self._color)
+            self._glyph_buffer = None
         self._should_recompute_primary_surface = False
 
         self._compute_secondary_surface(force=True)
 
 
+    @property
+    def glyph_atlas(self):
+        """
+        Turn this on for text that changes all the time, like timers, scores and counters:
+
+            timer = play.new_text('0', glyph_atlas=True)
+
+        Each letter is drawn once and then copied, which is much faster than drawing the
+        whole text again every time it changes. Letters might be spaced very slightly differently.
+        """
+        return self._glyph_atlas
+
+    @glyph_atlas.setter
+    def glyph_atlas(self, on):
+        self._glyph_atlas = on
+        self._invalidate_primary()
+
     @property
     def words(self):
         return self._words
@@ -1319,7 +2092,7 @@ To fix this, either set the font to None, or make sure you have a font file (usu
     @words.setter
     def words(self, string):
         self._words = str(string)
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     @property
     def font(self):
@@ -1328,7 +2101,7 @@ To fix this, either set the font to None, or make sure you have a font file (usu
     @font.setter
     def font(self, font_name):
         self._font = str(font_name)
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     @property
     def font_size(self):
@@ -1337,7 +2110,7 @@ To fix this, either set the font to None, or make sure you have a font file (usu
     @font_size.setter
     def font_size(self, size):
         self._font_size = size
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
 
     @property 
     def color(self):
@@ -1346,9 +2119,248 @@ To fix this, either set the font to None, or make sure you have a font file (usu
     @color.setter
     def color(self, color_):
         self._color = color_
-        self._should_recompute_primary_surface = True
+        self._invalidate_primary()
+
+
+
+
+def new_particles(image_or_color='black', count=100, x=0, y=0, x_speed=0, y_speed=0, angle=0, turn_speed=0, size=100, transparency=100, radius=5):
+    return Particles(image_or_color=image_or_color, count=count, x=x, y=y, x_speed=x_speed, y_speed=y_speed,
+        angle=angle, turn_speed=turn_speed, size=size, transparency=transparency, radius=radius)
+
+_all_particles = []
+
+class Particles(object):
+    """
+    Lots of little things that move by themselves, like sparks, snow or smoke. Particles
+    are much faster than sprites, so you can have tens of thousands of them.
+
+    Every property holds one number per particle in a NumPy array:
+
+        import numpy
+
+        snow = play.new_particles('white', count=5000, radius=2)
+        snow.x = numpy.random.uniform(play.screen.left, play.screen.right, snow.count)
+        snow.y = numpy.random.uniform(play.screen.bottom, play.screen.top, snow.count)
+        snow.y_speed = numpy.random.uniform(-2, -0.5, snow.count)
+
+        @play.repeat_forever
+        def do():
+            fallen = snow.y < play.screen.bottom
+            snow.y[fallen] = play.screen.top # start again at the top
+
+    Setting a property to a single number sets it for every particle (e.g. `snow.turn_speed = 3`).
+    Speeds are in steps per frame. Particles are always drawn on top of sprites, and to keep
+    them fast their angle, size and transparency are rounded a little when they're drawn.
+    """
+    # how much angle, size and transparency are rounded when particles are drawn, so
+    # only a few different pictures have to be made
+    _ANGLE_STEP = 10
+    _SIZE_STEP = 5
+    _TRANSPARENCY_STEP = 5
+
+    def __new__(cls, *args, **kwargs):
+        _init()
+        return super().__new__(cls)
+
+    def __init__(self, image_or_color='black', count=100, x=0, y=0, x_speed=0, y_speed=0, angle=0, turn_speed=0, size=100, transparency=100, radius=5):
+        global _numpy
+        if _numpy is None:
+            import numpy as _numpy
+
+        self._count = count
+        self._image_or_color = image_or_color
+        self._radius = radius
+        self._is_hidden = False
+
+        self._x = self._make_array(x)
+        self._y = self._make_array(y)
+        self._x_speed = self._make_array(x_speed)
+        self._y_speed = self._make_array(y_speed)
+        self._angle = self._make_array(angle)
+        self._turn_speed = self._make_array(turn_speed)
+        self._size = self._make_array(size)
+        self._transparency = self._make_array(transparency)
+
+        # changes applied to every particle each frame
+        self.gravity = 0    # taken away from y_speed
+        self.grow_speed = 0 # added to size
+        self.fade_speed = 0 # taken away from transparency
+
+        self._compute_primary_surface()
+
+        self._blit_sequence = []
+        self._rect = None
+        _all_particles.append(self)
+
+    def _make_array(self, value):
+        return _numpy.array(_numpy.broadcast_to(value, (self._count,)), dtype=float)
+
+    def _compute_primary_surface(self):
+        image_or_color = self._image_or_color
+        if isinstance(image_or_color, str) and image_or_color.lower().strip().replace('-', '').replace(' ', '') not in _color_names:
+            # not a color name, so it should be an image file
+            try:
+                self._image_key, self._primary_pygame_surface = _image_cache.acquire(image_or_color)
+            except (pygame.error, OSError) as exc:
+                raise Oops(f"""We couldn't find a color or an image file named "{image_or_color}" for play.new_particles().
+If it's an image in a folder, make sure you add the folder name, too.""") from exc
+        else:
+            self._image_key = None
+            diameter = self._radius * 2
+            self._primary_pygame_surface = _new_surface((diameter, diameter))
+            pygame.draw.circle(self._primary_pygame_surface, _color_name_to_rgb(image_or_color), (self._radius, self._radius), self._radius)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def x(self):
+        return self._x
+    @x.setter
+    def x(self, value):
+        self._x[:] = value
+
+    @property
+    def y(self):
+        return self._y
+    @y.setter
+    def y(self, value):
+        self._y[:] = value
 
+    @property
+    def x_speed(self):
+        return self._x_speed
+    @x_speed.setter
+    def x_speed(self, value):
+        self._x_speed[:] = value
+
+    @property
+    def y_speed(self):
+        return self._y_speed
+    @y_speed.setter
+    def y_speed(self, value):
+        self._y_speed[:] = value
+
+    @property
+    def angle(self):
+        return self._angle
+    @angle.setter
+    def angle(self, value):
+        self._angle[:] = value
+
+    @property
+    def turn_speed(self):
+        return self._turn_speed
+    @turn_speed.setter
+    def turn_speed(self, value):
+        self._turn_speed[:] = value
+
+    @property
+    def size(self):
+        return self._size
+    @size.setter
+    def size(self, value):
+        self._size[:] = value
+
+    @property
+    def transparency(self):
+        return self._transparency
+    @transparency.setter
+    def transparency(self, value):
+        self._transparency[:] = value
+
+    def hide(self):
+        self._is_hidden = True
 
+    def show(self):
+        self._is_hidden = False
+
+    @property
+    def is_hidden(self):
+        return self._is_hidden
+
+    @is_hidden.setter
+    def is_hidden(self, hide):
+        self._is_hidden = hide
+
+    @property
+    def is_shown(self):
+        return not self._is_hidden
+
+    @is_shown.setter
+    def is_shown(self, show):
+        self._is_hidden = not show
+
+    def remove(self):
+        if self in _all_particles:
+            _all_particles.remove(self)
+        _image_cache.release(self._image_key)
+        self._image_key = None
+
+    def _update(self):
+        # move every particle at once
+        self._x += self._x_speed
+        self._y += self._y_speed
+        self._angle += self._turn_speed
+        if self.gravity:
+            self._y_speed -= self.gravity
+        if self.grow_speed:
+            self._size += self.grow_speed
+        if self.fade_speed:
+            self._transparency -= self.fade_speed
+
+    def _compute_blits(self):
+        """
+        Work out which picture to draw for every particle and where, ready for Surface.blits().
+        """
+        np = _numpy
+        visible = (self._size > 0) & (self._transparency > 0)
+        if not visible.any():
+            self._blit_sequence = []
+            self._rect = None
+            return
+
+        # round every particle to a picture number, then make (or reuse) one picture per number
+        zoom = camera._zoom / 100.
+        turns = 360 // self._ANGLE_STEP
+        angles = np.rint(self._angle[visible] / self._ANGLE_STEP).astype(np.int64) % turns
+        sizes = np.rint(self._size[visible] * zoom / self._SIZE_STEP).astype(np.int64)
+        transparencies = np.rint(np.minimum(self._transparency[visible], 100) / self._TRANSPARENCY_STEP).astype(np.int64)
+        levels = 100 // self._TRANSPARENCY_STEP + 1
+        picture_numbers, which_picture = np.unique((sizes * turns + angles) * levels + transparencies, return_inverse=True)
+        which_picture = which_picture.reshape(-1)
+
+        pictures = []
+        widths = np.empty(len(picture_numbers))
+        heights = np.empty(len(picture_numbers))
+        for i, number in enumerate(picture_numbers.tolist()):
+            size_and_angle, transparency = divmod(number, levels)
+            size, angle = divmod(size_and_angle, turns)
+            key = (angle * self._ANGLE_STEP, size * self._SIZE_STEP, transparency * self._TRANSPARENCY_STEP)
+            picture = _transform_cache.get(self._primary_pygame_surface, key)
+            if picture is None:
+                picture = _transform_surface(self._primary_pygame_surface, *key)
+                _transform_cache.put(self._primary_pygame_surface, key, picture)
+            pictures.append(picture)
+            widths[i], heights[i] = picture.get_size()
+
+        # top-left corner of each particle in pygame coordinates
+        lefts = np.rint(screen._half_width + (self._x[visible] - camera._x) * zoom - widths[which_picture]/2.).astype(np.int64)
+        tops = np.rint(screen._half_height - (self._y[visible] - camera._y) * zoom - heights[which_picture]/2.).astype(np.int64)
+
+        self._blit_sequence = list(zip(
+            [pictures[i] for i in which_picture.tolist()],
+            zip(lefts.tolist(), tops.tolist())))
+        left, top = int(lefts.min()), int(tops.min())
+        self._rect = pygame.Rect(left, top,
+            int((lefts + widths[which_picture]).max()) - left,
+            int((tops + heights[which_picture]).max()) - top)
+
+    def _draw(self):
+        if self._blit_sequence:
+            _pygame_display.blits(self._blit_sequence, doreturn=False)
 
 
 # @decorator
@@ -1359,10 +2371,59 @@ def when_sprite_clicked(*sprites):
         return func
     return wrapper
 
-pygame.key.set_repeat(200, 16)
+def when_sprites_touch(a, b):
+    """
+    Run a function when two sprites start touching. Both sprites need to have physics
+    turned on (see start_physics()):
+
+        @play.when_sprites_touch(ball, goal)
+        def do():
+            score.words = 'GOAL!'
+    """
+    def wrapper(func):
+        _add_touch_callback(a, b, func)
+        return func
+    return wrapper
+
+class _KeyCallbacks(object):
+    """
+    Key press (or key release) callbacks, looked up by key name so that each key
+    event only looks at the callbacks that care about that key.
+    """
+    def __init__(self):
+        self._callbacks = []
+        self._by_key = {} # key name -> callbacks for that key
+        self._any_key = [] # callbacks with keys=None, for @when_any_key_pressed etc.
+
+    def __iter__(self):
+        return iter(self._callbacks)
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def append(self, callback):
+        callback.order = len(self._callbacks)
+        self._callbacks.append(callback)
+        if callback.keys is None:
+            self._any_key.append(callback)
+        else:
+            for key in set(callback.keys):
+                self._by_key.setdefault(key, []).append(callback)
+
+    def for_key(self, key):
+        """
+        Returns the callbacks for a key, in the order they were made.
+        """
+        callbacks = self._by_key.get(key)
+        if not callbacks:
+            return self._any_key
+        if not self._any_key:
+            return callbacks
+        return sorted(callbacks + self._any_key, key=lambda callback: callback.order)
+
 _pressed_keys = {}
-_keypress_callbacks = []
-_keyrelease_callbacks = []
+_keypress_callbacks = _KeyCallbacks()
+_keyrelease_callbacks = _KeyCallbacks()
 
 # @decorator
 def when_any_key_pressed(func):
@@ -1451,28 +2512,412 @@ def key_is_pressed(*keys):
             return True
     return False
 
-_NUM_SIMULATION_STEPS = 3
-def _simulate_physics():
-    # more steps means more accurate simulation, but more processing time
-    for _ in range(_NUM_SIMULATION_STEPS):
-        # the smaller the simulation step, the more accurate the simulation
-        _physics_space.step(1/(60.0*_NUM_SIMULATION_STEPS))
+# more steps means more accurate simulation, but more processing time
+_physics_steps_per_second = 180
+_max_physics_steps_per_frame = 12
+_interpolate_physics = False
+def set_physics_rate(steps_per_second=180, max_steps_per_frame=12, interpolate=False):
+    """
+    Change how often physics is simulated. Physics always runs at the same speed no
+    matter how fast frames are drawn; this only changes how accurate it is.
+
+        play.set_physics_rate(steps_per_second=60)  # less accurate, but faster on slow computers
 
-_loop = _asyncio.get_event_loop()
-_loop.set_debug(False)
+    `max_steps_per_frame` limits how much physics catches up when a frame takes a long time.
+    With `interpolate=True`, sprites are drawn part of the way between physics steps,
+    which makes movement look smoother when there are few steps per second.
+    """
+    global _physics_steps_per_second, _max_physics_steps_per_frame, _interpolate_physics
+    if steps_per_second <= 0 or max_steps_per_frame < 1:
+        raise Oops(f"""play.set_physics_rate() needs steps_per_second to be more than 0 and max_steps_per_frame to be at least 1.
+Instead it got steps_per_second={steps_per_second} and max_steps_per_frame={max_steps_per_frame}.""")
+    _physics_steps_per_second = steps_per_second
+    _max_physics_steps_per_frame = int(max_steps_per_frame)
+    _interpolate_physics = interpolate
+
+_physics = {
+    'time_left': 0.0, # seconds of game time that haven't been simulated yet
+    'last_time': None,
+    'alpha': 1.0, # how far between the last two physics steps the screen should be drawn (0 to 1)
+    'previous_positions': {}, # {body: position} from before the last step, for interpolation
+}
+def _simulate_physics():
+    now = _time.perf_counter()
+    if _headless or _physics['last_time'] is None:
+        # frames aren't waited for when headless, so count every frame as 1/60 of a second
+        elapsed = 1/60.
+    else:
+        elapsed = now - _physics['last_time']
+    _physics['last_time'] = now
+
+    # the smaller the simulation step, the more accurate the simulation
+    step = 1/_physics_steps_per_second
+    _physics['time_left'] += elapsed
+    num_steps = int(_physics['time_left'] / step)
+    if num_steps > _max_physics_steps_per_frame:
+        # we're too far behind to catch up, so let the game slow down instead of freezing
+        num_steps = _max_physics_steps_per_frame
+        _physics['time_left'] = num_steps * step
+
+    if num_steps:
+        for body in _moved_static_bodies:
+            _physics_space.reindex_shapes_for_body(body)
+        _moved_static_bodies.clear()
+        # on frames without a step, sprites keep being drawn between these positions and the current ones
+        _physics['previous_positions'].clear()
+
+    for step_number in range(num_steps):
+        if _interpolate_physics and step_number == num_steps - 1:
+            for body in _physics_space.bodies:
+                if not body.is_sleeping:
+                    _physics['previous_positions'][body] = body.position
+        _physics_space.step(step)
+
+    _physics['time_left'] -= num_steps * step
+    _physics['alpha'] = _physics['time_left'] / step if _interpolate_physics else 1.0
+
+_loop = None # made by _init()
 
 _keys_pressed_this_frame = []
 _keys_released_this_frame = []
 _keys_to_skip = (pygame.K_MODE,)
-pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION])
-_clock = pygame.time.Clock()
+
+_FRAME_DURATION = 1/60.
+# when the next frame should start (in _loop.time() seconds) and how long the loop
+# was left free for other async work before it
+_frame_pacing = {'deadline': None, 'idle': 0.0}
+
+def _schedule_next_frame():
+    """
+    Run the next frame at the next 1/60th of a second instead of sleeping until
+    then, so timers and other async functions can run in the time left over.
+    """
+    if _headless:
+        # nobody is watching, so run as fast as possible
+        _loop.call_soon(_game_loop)
+        return
+
+    now = _loop.time()
+    deadline = _frame_pacing['deadline']
+    deadline = now + _FRAME_DURATION if deadline is None else deadline + _FRAME_DURATION
+    if deadline < now:
+        # this frame took too long. Start the next one right away, and if we're more
+        # than a whole frame behind, give up on catching up so we don't rush through frames
+        _profiler.overran()
+        if now - deadline > _FRAME_DURATION:
+            deadline = now
+    _frame_pacing['deadline'] = deadline
+    _frame_pacing['idle'] = max(deadline - now, 0.0)
+    _loop.call_at(deadline, _game_loop)
+
+def _sync_physics_sprites():
+    alpha = _physics['alpha']
+    previous_positions = _physics['previous_positions']
+    for sprite in _physics_sprites:
+        if sprite._is_hidden:
+            continue
+
+        body = sprite.physics._pymunk_body
+        if body.is_sleeping:
+            # pymunk puts bodies that stopped moving to sleep, so there's nothing to update
+            continue
+
+        if isinstance(sprite, line):
+            angle = _math.degrees(body.angle)
+            sprite._x = body.position.x - (sprite.length/2) * _math.cos(angle)
+            sprite._y = body.position.y - (sprite.length/2) * _math.sin(angle)
+            sprite._x1 = body.position.x + (sprite.length/2) * _math.cos(angle)
+            sprite._y1 = body.position.y + (sprite.length/2) * _math.sin(angle)
+            # sprite._length, sprite._angle = sprite._calc_length_angle()
+            sprite.angle = angle # line's angle setter also updates its end point
+        else:
+            x, y = body.position
+            # x != x only when x is nan, which can happen when changing sprite.physics.can_move
+            if x == x:
+                sprite._x = x
+            if y == y:
+                sprite._y = y
+
+            previous_position = previous_positions.get(body)
+            if previous_position is not None:
+                # draw the sprite between where it was before the last physics step and where it is now
+                sprite._interpolation_x = (previous_position.x - sprite._x) * (1 - alpha)
+                sprite._interpolation_y = (previous_position.y - sprite._y) * (1 - alpha)
+            else:
+                sprite._interpolation_x = sprite._interpolation_y = 0
+
+            # only make a new rotated image if the angle changed enough to draw differently
+            angle = _math.degrees(body.angle)
+            if _transform_cache_angle(angle) != _transform_cache_angle(sprite._angle):
+                sprite._invalidate_secondary()
+            sprite._angle = angle
+
+        sprite._changed()
+        sprite.physics._x_speed, sprite.physics._y_speed = body.velocity
+
+_clicked_sprites = [] # sprites whose is_clicked is True this frame
+_clickable_sprites = set() # sprites with @sprite.when_clicked callbacks
+
+_click_mode = 'all'
+def set_click_mode(mode):
+    """
+    Choose which sprites get clicked when sprites are on top of each other:
+
+        play.set_click_mode('all')     # every sprite under the mouse gets clicked (the default)
+        play.set_click_mode('topmost') # only the sprite drawn on top gets clicked
+    """
+    global _click_mode
+    if mode not in ('all', 'topmost'):
+        raise Oops(f"""play.set_click_mode() doesn't understand the mode '{mode}'.
+Try using either 'all' or 'topmost' instead, like this:
+
+    play.set_click_mode('topmost')
+""")
+    _click_mode = mode
+
+def set_collision_mode(mode):
+    """
+    Choose how play checks whether sprites are touching each other or the mouse:
+
+        play.set_collision_mode('box')     # sprites touch when the boxes around them overlap (the default)
+        play.set_collision_mode('precise') # sprites only touch when pixels you can see overlap
+
+    'precise' is right for circles, turned sprites and images with see-through parts, but
+    it's a little slower. Lines are always checked with the box around them.
+    """
+    global _collision_mode
+    if mode not in ('box', 'precise'):
+        raise Oops(f"""play.set_collision_mode() doesn't understand the mode '{mode}'.
+Try using either 'box' or 'precise' instead, like this:
+
+    play.set_collision_mode('precise')
+""")
+    _collision_mode = mode
+
+def _sprites_under_mouse():
+    # only sprites in the same part of the screen as the mouse need to be checked
+    found = [
+        sprite for sprite in _spatial_index.query_point(mouse.x, mouse.y)
+        if not sprite.is_hidden and not type(sprite) == line and _point_touching_sprite(mouse, sprite)
+    ]
+    if not found:
+        return found
+    if _click_mode == 'topmost':
+        # the sprite that's drawn last is on top
+        return [max(found, key=lambda sprite: sprite._render_key)]
+    found.sort(key=lambda sprite: sprite._render_key)
+    return found
+
+_render_mode = 'full'
+def set_render_mode(mode):
+    """
+    Choose how the screen gets redrawn every frame:
+
+        play.set_render_mode('full')  # redraw everything every frame (the default)
+        play.set_render_mode('dirty') # only redraw the parts of the screen that changed
+        play.set_render_mode('off')   # don't draw anything (useful with PLAY_HEADLESS)
+
+    'dirty' is much faster for programs where most sprites stay still.
+    """
+    global _render_mode
+    if mode not in ('full', 'dirty', 'off'):
+        raise Oops(f"""play.set_render_mode() doesn't understand the mode '{mode}'.
+Try using 'full', 'dirty' or 'off' instead, like this:
+
+    play.set_render_mode('dirty')
+""")
+    _render_mode = mode
+    _drawn_sprite_rects.clear()
+
+def _line_screen_position(sprite):
+    # a line's end points and thickness on the screen
+    zoom = camera._zoom / 100.
+    x = screen._half_width + (sprite.x - camera._x) * zoom
+    y = screen._half_height - (sprite.y - camera._y) * zoom
+    x1 = screen._half_width + (sprite.x1 - camera._x) * zoom
+    y1 = screen._half_height - (sprite.y1 - camera._y) * zoom
+    thickness = sprite.thickness if zoom == 1 else max(round(sprite.thickness * zoom), 1)
+    return x, y, x1, y1, thickness
+
+def _sprite_screen_rect(sprite):
+    if type(sprite) == line:
+        x, y, x1, y1, thickness = _line_screen_position(sprite)
+        rect = pygame.Rect(min(x, x1), min(y, y1), abs(x1 - x), abs(y1 - y))
+        # leave room for thick and anti-aliased lines
+        return rect.inflate(thickness*2 + 2, thickness*2 + 2)
+    if type(sprite) == _CachedLayer:
+        return sprite._secondary_pygame_surface.get_rect()
+    surface = sprite._screen_surface()
+    return pygame.Rect(sprite._pygame_x(surface), sprite._pygame_y(surface), surface.get_width(), surface.get_height())
+
+def _draw_line(sprite, target):
+    # @hack: Line-drawing code should probably be in the line._compute_primary_surface function
+    # but the coordinates work different for lines than other sprites.
+
+
+    # x = screen.width/2 + sprite.x
+    # y = screen.height/2 - sprite.y - sprite.thickness
+    # _pygame_display.blit(sprite._secondary_pygame_surface, (x,y) )
+
+    x, y, x1, y1, thickness = _line_screen_position(sprite)
+    if thickness == 1:
+         pygame.draw.aaline(target, _color_name_to_rgb(sprite.color), (x,y), (x1,y1), True)
+    else:
+         pygame.draw.line(target, _color_name_to_rgb(sprite.color), (x,y), (x1,y1), thickness)
+
+def _draw_sprites(sprites, target=None):
+    """
+    Draw sprites in order onto `target` (the screen if it's None). Sprites are drawn
+    together with one Surface.blits() call, except for lines, which are drawn differently.
+    """
+    if target is None:
+        target = _pygame_display
+    half_width = screen._half_width
+    half_height = screen._half_height
+    camera_x = camera._x
+    camera_y = camera._y
+    zoom = camera._zoom / 100.
+    blits = []
+    for sprite in sprites:
+        if type(sprite) == line:
+            # draw what's waiting first so sprites still overlap in the right order
+            if blits:
+                target.blits(blits, doreturn=False)
+                blits = []
+            _draw_line(sprite, target)
+        elif type(sprite) == _CachedLayer:
+            blits.append((sprite._secondary_pygame_surface, (0, 0)))
+        else:
+            # same as sprite._pygame_x() and sprite._pygame_y()
+            surface = sprite._secondary_pygame_surface if zoom == 1 else sprite._screen_surface()
+            blits.append((surface, (
+                half_width + (sprite._x + sprite._interpolation_x - camera_x) * zoom - surface.get_width()/2.,
+                half_height - (sprite._y + sprite._interpolation_y - camera_y) * zoom - surface.get_height()/2.)))
+    if blits:
+        target.blits(blits, doreturn=False)
+
+def _render_full(sprites, visible_particles):
+    """
+    Draw everything. Returns None, which means the whole screen needs to be shown.
+    """
+    _pygame_display.fill(_color_name_to_rgb(backdrop))
+    _draw_sprites(sprites)
+    for particles in visible_particles:
+        particles._draw()
+    _profiler.draw_overlay(_pygame_display)
+    return None
+
+# what each sprite looked like the last time it was drawn in 'dirty' render mode, as {sprite: (rect, surface, render key)}
+_drawn_sprite_rects = {}
+_drawn_particle_rects = {} # particles -> the area they covered the last time they were drawn
+_drawn_screen = {'backdrop': None, 'size': None, 'overlay': None, 'camera': None}
+def _render_dirty_rects(sprites, visible_particles):
+    """
+    Redraw only the parts of the screen where a sprite appeared, disappeared, moved or changed
+    since the last frame. Returns a list of the parts of the screen that changed, or None if
+    the whole screen was redrawn.
+    """
+    screen_rects = [_sprite_screen_rect(sprite) for sprite in sprites]
+
+    if (_drawn_screen['backdrop'] != backdrop or _drawn_screen['size'] != _pygame_display.get_size()
+            or _drawn_screen['camera'] != camera._state()):
+        # nothing on the screen can be reused, so draw everything
+        _drawn_screen['backdrop'] = backdrop
+        _drawn_screen['size'] = _pygame_display.get_size()
+        _drawn_screen['camera'] = camera._state()
+        _drawn_sprite_rects.clear()
+        for sprite, rect in zip(sprites, screen_rects):
+            _drawn_sprite_rects[sprite] = (rect, sprite._secondary_pygame_surface, sprite._render_key)
+        _drawn_particle_rects.clear()
+        for particles in visible_particles:
+            _drawn_particle_rects[particles] = particles._rect
+        _render_full(sprites, visible_particles)
+        _drawn_screen['overlay'] = _profiler.draw_overlay(_pygame_display)
+        return None
+
+    dirty_rects = []
+    previously_drawn = _drawn_sprite_rects.copy()
+    _drawn_sprite_rects.clear()
+    for sprite, rect in zip(sprites, screen_rects):
+        surface = sprite._secondary_pygame_surface
+        _drawn_sprite_rects[sprite] = (rect, surface, sprite._render_key)
+
+        previous = previously_drawn.pop(sprite, None)
+        if previous is None:
+            dirty_rects.append(rect)
+        elif previous[0] != rect or previous[1] is not surface or previous[2] != sprite._render_key:
+            # moved, changed, or is now in front of or behind different sprites
+            if previous[0].colliderect(rect):
+                # sprites that moved a little are redrawn in one region instead of two
+                dirty_rects.append(previous[0].union(rect))
+            else:
+                dirty_rects.append(previous[0])
+                dirty_rects.append(rect)
+
+    # sprites that were hidden or removed since the last frame
+    for rect, surface, render_key in previously_drawn.values():
+        dirty_rects.append(rect)
+
+    # particles usually all move every frame, so their whole area is redrawn
+    previously_drawn = _drawn_particle_rects.copy()
+    _drawn_particle_rects.clear()
+    for particles in visible_particles:
+        _drawn_particle_rects[particles] = particles._rect
+        previous = previously_drawn.pop(particles, None)
+        if previous:
+            dirty_rects.append(previous)
+        if particles._rect:
+            dirty_rects.append(particles._rect)
+    for previous in previously_drawn.values():
+        if previous:
+            dirty_rects.append(previous)
+
+    # the profiler overlay is redrawn every frame
+    if _drawn_screen['overlay']:
+        dirty_rects.append(_drawn_screen['overlay'])
+
+    # lines come out slightly differently when only part of them is drawn, so any
+    # part of the screen that has some of a line in it is grown to fit the whole line
+    line_rects = [rect for sprite, rect in zip(sprites, screen_rects) if type(sprite) == line]
+    if line_rects:
+        for i, dirty_rect in enumerate(dirty_rects):
+            grown = True
+            while grown:
+                grown = False
+                for rect in line_rects:
+                    if dirty_rect.colliderect(rect) and not dirty_rect.contains(rect):
+                        dirty_rect = dirty_rect.union(rect)
+                        grown = True
+            dirty_rects[i] = dirty_rect
+
+    background_color = _color_name_to_rgb(backdrop)
+    for dirty_rect in dirty_rects:
+        _pygame_display.set_clip(dirty_rect)
+        _pygame_display.fill(background_color, dirty_rect)
+        _draw_sprites([sprites[index] for index in dirty_rect.collidelistall(screen_rects)])
+    _pygame_display.set_clip(None)
+
+    # particles are on top of every sprite, and all of their area was just cleared
+    for particles in visible_particles:
+        particles._draw()
+
+    _drawn_screen['overlay'] = _profiler.draw_overlay(_pygame_display)
+    if _drawn_screen['overlay']:
+        dirty_rects.append(_drawn_screen['overlay'])
+
+    return dirty_rects
+
 def _game_loop():
     _keys_pressed_this_frame.clear() # do this instead of `_keys_pressed_this_frame = []` to save a tiny bit of memory
     _keys_released_this_frame.clear()
     click_happened_this_frame = False
     click_release_happened_this_frame = False
 
-    _clock.tick(60)
+    profiling = _profiler.running
+    if profiling:
+        _profiler.begin_frame()
+        phase_start = _time.perf_counter()
+
     for event in pygame.event.get():
         if event.type == pygame.QUIT or (
             event.type == pygame.KEYDOWN and event.key == pygame.K_q and (
@@ -1488,7 +2933,7 @@ def _game_loop():
             click_release_happened_this_frame = True
             mouse._is_clicked = False
         if event.type == pygame.MOUSEMOTION:
-            mouse.x, mouse.y = (event.pos[0] - screen.width/2.), (screen.height/2. - event.pos[1])
+            mouse._screen_x, mouse._screen_y = (event.pos[0] - screen._half_width), (screen._half_height - event.pos[1])
         if event.type == pygame.KEYDOWN:
             if not (event.key in _keys_to_skip):
                 name = _pygame_key_to_name(event)
@@ -1499,22 +2944,28 @@ def _game_loop():
                 _keys_released_this_frame.append(_pressed_keys[event.key])
                 del _pressed_keys[event.key]
 
+    # the mouse's position in the world changes when the camera moves, even if the mouse doesn't
+    zoom = camera._zoom / 100.
+    mouse.x = camera._x + mouse._screen_x / zoom
+    mouse.y = camera._y + mouse._screen_y / zoom
+    if profiling:
+        phase_start = _profiler.record('events', phase_start)
 
 
     ############################################################
     # @when_any_key_pressed and @when_key_pressed callbacks
     ############################################################
     for key in _keys_pressed_this_frame:
-        for callback in _keypress_callbacks:
-            if not callback.is_running and (callback.keys is None or key in callback.keys):
+        for callback in _keypress_callbacks.for_key(key):
+            if not callback.is_running:
                 _loop.create_task(callback(key))
 
     ############################################################
     # @when_any_key_released and @when_key_released callbacks
     ############################################################
     for key in _keys_released_this_frame:
-        for callback in _keyrelease_callbacks:
-            if not callback.is_running and (callback.keys is None or key in callback.keys):
+        for callback in _keyrelease_callbacks.for_key(key):
+            if not callback.is_running:
                 _loop.create_task(callback(key))
 
 
@@ -1535,14 +2986,18 @@ def _game_loop():
     #############################
     # @repeat_forever callbacks
     #############################
-    for callback in _repeat_forever_callbacks:
-        if not callback.is_running:
-            _loop.create_task(callback())
+    # wake up every repeat_forever callback that's waiting for this frame
+    global _next_frame
+    this_frame, _next_frame = _next_frame, _loop.create_future()
+    this_frame.set_result(None)
 
     #############################
     # physics simulation
     #############################
-    _loop.call_soon(_simulate_physics)
+    _loop.call_soon(_profiler.timed, 'physics', _simulate_physics)
+
+    if profiling:
+        phase_start = _profiler.record('callbacks', phase_start)
 
 
     # 1.  get pygame events
@@ -1560,88 +3015,113 @@ def _game_loop():
 
 
 
-    _pygame_display.fill(_color_name_to_rgb(backdrop))
-
     # BACKGROUND COLOR
     # note: cannot use screen.fill((1, 1, 1)) because pygame's screen
     #       does not support fill() on OpenGL surfaces
     # gl.glClearColor(_background_color[0], _background_color[1], _background_color[2], 1)
     # gl.glClear(gl.GL_COLOR_BUFFER_BIT)
 
-    for sprite in all_sprites:
-
+    for sprite in _clicked_sprites:
         sprite._is_clicked = False
-
-        if sprite.is_hidden:
+    _clicked_sprites.clear()
+
+    ######################################################
+    # update sprites with results of physics simulation
+    ######################################################
+    _sync_physics_sprites()
+
+    # @sprite.when_touching callbacks for sprites that started touching during the last physics steps
+    for key in _touches_this_frame:
+        for callback in _touch_callbacks[key]:
+            if not callback.is_running:
+                _loop.create_task(callback())
+    _touches_this_frame.clear()
+
+    visible_particles = [particles for particles in _all_particles if not particles._is_hidden]
+    for particles in visible_particles:
+        particles._update()
+    if profiling:
+        phase_start = _profiler.record('physics', phase_start)
+
+    # do sprite image transforms (re-rendering images/fonts, scaling, rotating, etc) for
+    # sprites that changed, before anything is drawn so sprites are never drawn out of date
+    _recompute_surfaces()
+    if profiling:
+        phase_start = _profiler.record('surfaces', phase_start)
+
+    # only sprites near the part of the world the camera can see get drawn. The area is
+    # made a little bigger so sprites moved by physics smoothing (see set_physics_rate) aren't missed
+    margin = _spatial_index.cell_size
+    on_screen = _spatial_index.query(camera.left - margin, camera.bottom - margin, camera.right + margin, camera.top + margin)
+
+    visible_sprites = []
+    visible_cached_layers = []
+    cached_layer = None
+    for sprite in _render_order:
+
+        if sprite._is_hidden:
             continue
 
-        ######################################################
-        # update sprites with results of physics simulation
-        ######################################################
-        if sprite.physics and sprite.physics.can_move:
-
-            body = sprite.physics._pymunk_body
-            angle = _math.degrees(body.angle)
-            if isinstance(sprite, line):
-                sprite._x = body.position.x - (sprite.length/2) * _math.cos(angle)
-                sprite._y = body.position.y - (sprite.length/2) * _math.sin(angle)
-                sprite._x1 = body.position.x + (sprite.length/2) * _math.cos(angle)
-                sprite._y1 = body.position.y + (sprite.length/2) * _math.sin(angle)
-                # sprite._length, sprite._angle = sprite._calc_length_angle()
-            else:
-                if str(body.position.x) != 'nan': # this condition can happen when changing sprite.physics.can_move
-                    sprite._x = body.position.x
-                if str(body.position.y) != 'nan':
-                    sprite._y = body.position.y
-
-            sprite.angle = angle # needs to be .angle, not ._angle so surface gets recalculated
-            sprite.physics._x_speed, sprite.physics._y_speed = body.velocity
-
-        #################################
-        # @sprite.when_clicked events
-        #################################
-        if mouse.is_clicked and not type(sprite) == line:
-            if _point_touching_sprite(mouse, sprite):
-                # only run sprite clicks on the frame the mouse was clicked
-                if click_happened_this_frame:
-                    sprite._is_clicked = True
-                    for callback in sprite._when_clicked_callbacks:
-                        if not callback.is_running:
-                            _loop.create_task(callback())
-
-
-        # do sprite image transforms (re-rendering images/fonts, scaling, rotating, etc)
-
-        # we put it in the event loop instead of just recomputing immediately because if we do it
-        # synchronously then the data and rendered image may get out of sync
-        if sprite._should_recompute_primary_surface:
-            # recomputing primary surface also recomputes secondary surface
-            _loop.call_soon(sprite._compute_primary_surface)
-        elif sprite._should_recompute_secondary_surface:
-            _loop.call_soon(sprite._compute_secondary_surface)
-
-        if type(sprite) == line:
-            # @hack: Line-drawing code should probably be in the line._compute_primary_surface function
-            # but the coordinates work different for lines than other sprites.
-
-
-            # x = screen.width/2 + sprite.x
-            # y = screen.height/2 - sprite.y - sprite.thickness
-            # _pygame_display.blit(sprite._secondary_pygame_surface, (x,y) )
+        if sprite not in on_screen and type(sprite) != line:
+            # lines aren't skipped because their position in _spatial_index isn't exact
+            continue
 
-            x = screen.width/2 + sprite.x
-            y = screen.height/2 - sprite.y
-            x1 = screen.width/2 + sprite.x1
-            y1 = screen.height/2 - sprite.y1
-            if sprite.thickness == 1:
-                 pygame.draw.aaline(_pygame_display, _color_name_to_rgb(sprite.color), (x,y), (x1,y1), True)
-            else:
-                 pygame.draw.line(_pygame_display, _color_name_to_rgb(sprite.color), (x,y), (x1,y1), sprite.thickness)
+        if sprite._layer in _cached_layers:
+            # sprites in a cached layer are drawn all at once (sprites in a layer are next to each other)
+            if cached_layer is None or cached_layer.layer != sprite._layer:
+                cached_layer = _cached_layers[sprite._layer]
+                cached_layer.sprites.clear()
+                visible_sprites.append(cached_layer)
+                visible_cached_layers.append(cached_layer)
+            cached_layer.sprites.append(sprite)
         else:
-            _pygame_display.blit(sprite._secondary_pygame_surface, (sprite._pygame_x(), sprite._pygame_y()) )
-
-    pygame.display.flip()
-    _loop.call_soon(_game_loop)
+            visible_sprites.append(sprite)
+
+    if _render_mode != 'off':
+        for cached_layer in visible_cached_layers:
+            if cached_layer._secondary_pygame_surface is None or cached_layer.camera != camera._state():
+                cached_layer._redraw()
+    if profiling:
+        phase_start = _profiler.record('render', phase_start)
+
+    #################################
+    # @sprite.when_clicked events
+    #################################
+    # only run sprite clicks on the frame the mouse was clicked
+    if click_happened_this_frame and mouse.is_clicked:
+        _clicked_sprites.extend(_sprites_under_mouse())
+        for sprite in _clicked_sprites:
+            sprite._is_clicked = True
+            if sprite in _clickable_sprites:
+                for callback in sprite._when_clicked_callbacks:
+                    if not callback.is_running:
+                        _loop.create_task(callback())
+
+    if profiling:
+        phase_start = _profiler.record('callbacks', phase_start)
+
+    if _render_mode != 'off':
+        for particles in visible_particles:
+            particles._compute_blits()
+
+    if _render_mode == 'dirty':
+        updated_rects = _render_dirty_rects(visible_sprites, visible_particles)
+    elif _render_mode == 'full':
+        updated_rects = _render_full(visible_sprites, visible_particles)
+    if profiling:
+        phase_start = _profiler.record('render', phase_start)
+
+    if _render_mode != 'off' and not _headless:
+        if updated_rects is None:
+            pygame.display.flip()
+        elif updated_rects:
+            pygame.display.update(updated_rects)
+    if profiling:
+        _profiler.record('display', phase_start)
+
+    _schedule_next_frame()
+    if profiling:
+        _profiler.end_frame(_frame_pacing['idle'])
     return True
 
 
@@ -1676,6 +3156,7 @@ async def animate():
 #     return getattr(meth, '__objclass__', None)  # handle special descriptor objects
 
 _repeat_forever_callbacks = []
+_next_frame = None # a future that's resolved when the next frame starts
 # @decorator
 def repeat_forever(func):
     """
@@ -1692,12 +3173,17 @@ def repeat_forever(func):
     """
     async_callback = _make_async(func)
     async def repeat_wrapper():
-        repeat_wrapper.is_running = True
-        await async_callback()
-        repeat_wrapper.is_running = False
+        # one long-running task per callback instead of a new task every frame.
+        # If the callback takes longer than a frame (e.g. it awaits play.timer()),
+        # it just runs again on the first frame after it finishes.
+        while True:
+            await _next_frame
+            await async_callback()
 
-    repeat_wrapper.is_running = False
     _repeat_forever_callbacks.append(repeat_wrapper)
+    if _loop is not None and _loop.is_running():
+        # the program has already started, e.g. this was called inside a callback
+        _loop.create_task(repeat_wrapper())
     return func
 
 
@@ -1740,9 +3226,16 @@ def start_program():
 
     play.start_program() should almost certainly go at the very end of your program.
     """
+    global _next_frame
+    _init()
+
     for func in _when_program_starts_callbacks:
         _loop.create_task(func())
 
+    _next_frame = _loop.create_future()
+    for callback in _repeat_forever_callbacks:
+        _loop.create_task(callback())
+
     _loop.call_soon(_game_loop)
     try:
         _loop.run_forever()
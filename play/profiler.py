@@ -0,0 +1,250 @@
+"""
+Measures how long each part of every frame takes.
+
+Example:
+
+    play.profiler.start()
+    play.profiler.show_overlay() # draw the numbers on the screen
+
+    @play.when_key_pressed('p')
+    def do(key):
+        print(play.profiler.percentiles('physics')) # e.g. {'p50': 0.41, 'p95': 0.62, 'p99': 1.3}
+
+All times are in milliseconds and cover the last `frames` frames.
+"""
+import math as _math
+import time as _time
+import types as _types
+from collections import deque as _deque
+
+import pygame as _pygame
+
+from .exceptions import Oops
+
+# the parts of a frame that get timed, in the order they happen
+PHASES = (
+    'wait',      # time left over before the next frame that nothing used
+    'events',    # reading mouse, keyboard and window events
+    'callbacks', # starting key, mouse, click and repeat_forever callbacks
+    'physics',   # simulating physics and moving sprites to match
+    'surfaces',  # re-making sprite images after they change (size, angle, color, words, etc.)
+    'render',    # drawing the backdrop and sprites
+    'display',   # showing the finished frame on the screen
+    'tasks',     # running your callbacks and async functions
+)
+
+running = False
+_frames = _deque(maxlen=300)
+_current_frame = {}
+_frame_start = None
+_late_frames = _deque(maxlen=300) # True for every remembered frame that took longer than 1/60th of a second
+_overran = False
+_gap = {'idle': 0.0, 'measured': 0.0} # the time between drawing a frame and starting the next one
+_timing_steps = False # True while timed_steps() is timing a step, so nested async functions aren't counted twice
+
+_overlay = {'shown': False, 'font': None, 'surface': None, 'updated_at': 0}
+
+
+def start(frames=300):
+    """
+    Start timing frames. Only the last `frames` frames are remembered.
+    """
+    global running, _frames, _frame_start, _late_frames, _overran
+    running = True
+    _frames = _deque(maxlen=frames)
+    _late_frames = _deque(maxlen=frames)
+    _current_frame.clear()
+    _frame_start = None
+    _overran = False
+    _gap.update(idle=0.0, measured=0.0)
+
+def stop():
+    global running
+    running = False
+
+def record(phase, since):
+    """
+    Add the time between `since` (from time.perf_counter()) and now to a phase. Returns now
+    so that the next phase can be timed from there.
+    """
+    now = _time.perf_counter()
+    _current_frame[phase] = _current_frame.get(phase, 0.0) + (now - since)
+    return now
+
+def add(phase, seconds):
+    # for time that was measured some other way
+    _current_frame[phase] = _current_frame.get(phase, 0.0) + seconds
+
+def overran():
+    """
+    Called when the current frame took too long and the next one will start late.
+    """
+    global _overran
+    _overran = True
+
+def timed(phase, func, *args):
+    # used for work that runs later on the event loop, like sprite image updates
+    if not running:
+        return func(*args)
+    start_time = _time.perf_counter()
+    result = func(*args)
+    record(phase, start_time)
+    return result
+
+@_types.coroutine
+def timed_steps(phase, coroutine):
+    """
+    Await `coroutine`, adding the time it spends running to a phase. Time spent waiting
+    (e.g. in `await play.timer()`) isn't counted, since other things can run then.
+    """
+    global _timing_steps
+    value, error = None, None
+    while True:
+        outermost = not _timing_steps
+        _timing_steps = True
+        start_time = _time.perf_counter()
+        try:
+            if error is None:
+                waiting_for = coroutine.send(value)
+            else:
+                waiting_for = coroutine.throw(error)
+        except StopIteration as finished:
+            return finished.value
+        finally:
+            if outermost:
+                _timing_steps = False
+                if running:
+                    record(phase, start_time)
+        # pass whatever the coroutine is waiting for on to the event loop, and the result back
+        try:
+            value, error = (yield waiting_for), None
+        except GeneratorExit:
+            coroutine.close()
+            raise
+        except BaseException as exception: # e.g. the task was cancelled
+            value, error = None, exception
+
+def end_frame(idle):
+    """
+    Called when a frame is finished, with how long until the next frame is due to start.
+    Async functions and physics run in that time, so they're taken out of 'wait' later.
+    """
+    _gap['idle'] = idle
+    _gap['measured'] = sum(_current_frame.values())
+
+def begin_frame():
+    """
+    Called at the very start of every frame. Finishes timing the previous frame.
+    """
+    global _frame_start, _overran
+    now = _time.perf_counter()
+    if _frame_start is not None:
+        total = now - _frame_start
+        # the waiting time is whatever part of the gap after the last frame nothing else used
+        used = sum(_current_frame.values()) - _gap['measured']
+        _current_frame['wait'] = max(_gap['idle'] - used, 0.0)
+        _current_frame['frame'] = total
+        _frames.append(dict(_current_frame))
+        _late_frames.append(_overran)
+    _current_frame.clear()
+    _gap.update(idle=0.0, measured=0.0)
+    _frame_start = now
+    _overran = False
+
+def _percentile(sorted_values, percent):
+    # nearest-rank percentile
+    rank = _math.ceil(percent/100. * len(sorted_values))
+    return sorted_values[max(rank - 1, 0)]
+
+def percentiles(phase='frame'):
+    """
+    Returns the 50th, 95th and 99th percentile times (in milliseconds) for a phase, e.g.:
+
+        play.profiler.percentiles('render') # {'p50': 2.1, 'p95': 3.4, 'p99': 7.9}
+
+    Use phase='frame' (the default) for whole frames.
+    """
+    if phase != 'frame' and phase not in PHASES:
+        raise Oops(f"""play.profiler doesn't know about a part of the frame called '{phase}'.
+Try one of these instead: 'frame', {', '.join(repr(name) for name in PHASES)}""")
+    values = sorted(frame.get(phase, 0.0) * 1000 for frame in _frames)
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    return {
+        'p50': _percentile(values, 50),
+        'p95': _percentile(values, 95),
+        'p99': _percentile(values, 99),
+    }
+
+def report():
+    """
+    Returns percentiles for every phase and the whole frame, as {phase: {'p50': ..., 'p95': ..., 'p99': ...}}.
+    """
+    results = {phase: percentiles(phase) for phase in PHASES}
+    results['frame'] = percentiles('frame')
+    return results
+
+def fps():
+    """
+    Returns the average frames per second over the remembered frames.
+    """
+    if not _frames:
+        return 0.0
+    total = sum(frame['frame'] for frame in _frames)
+    return len(_frames) / total if total else 0.0
+
+def late_frames():
+    """
+    Returns how many of the remembered frames took longer than 1/60th of a second,
+    which made the frame after them start late.
+    """
+    return sum(_late_frames)
+
+def show_overlay():
+    """
+    Draw the frame rate and how long each phase takes in the top-left corner of the screen.
+    Also starts the profiler if it isn't running.
+    """
+    if not running:
+        start()
+    _overlay['shown'] = True
+
+def hide_overlay():
+    _overlay['shown'] = False
+    _overlay['surface'] = None
+
+def overlay_is_shown():
+    return _overlay['shown']
+
+def draw_overlay(display):
+    """
+    Draw the overlay onto the display. Returns the area drawn on, or None if nothing was drawn.
+    """
+    if not _overlay['shown']:
+        return None
+
+    now = _time.perf_counter()
+    if _overlay['surface'] is None or now - _overlay['updated_at'] > 0.5:
+        # re-make the overlay only twice a second so it's cheap to draw and easy to read
+        if _overlay['font'] is None:
+            _overlay['font'] = _pygame.font.Font(None, 18)
+        frame = percentiles('frame')
+        lines = [f"{fps():5.1f} fps   frame p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f} ms   {late_frames()} late"]
+        for phase in PHASES:
+            timings = percentiles(phase)
+            lines.append(f"{phase:>9}  {timings['p50']:6.2f} {timings['p95']:6.2f} {timings['p99']:6.2f}")
+
+        rendered = [_overlay['font'].render(line, True, (255, 255, 255)) for line in lines]
+        width = max(surface.get_width() for surface in rendered) + 8
+        height = sum(surface.get_height() for surface in rendered) + 8
+        surface = _pygame.Surface((width, height))
+        surface.fill((0, 0, 0))
+        y = 4
+        for line in rendered:
+            surface.blit(line, (4, y))
+            y += line.get_height()
+        surface.set_alpha(200)
+        _overlay['surface'] = surface
+        _overlay['updated_at'] = now
+
+    return display.blit(_overlay['surface'], (0, 0))
@@ -0,0 +1,122 @@
+class SpatialHash(object):
+    """
+    A uniform grid that remembers which cells each item's bounding box covers, so
+    finding the items near a point or rectangle only looks at a few cells instead
+    of at every item.
+
+    Coordinates are play coordinates (y goes up). Items that cover a huge number
+    of cells (or have positions that aren't finite numbers) are kept in a
+    separate list that every query returns, which keeps updates cheap.
+    """
+    MAX_CELLS_PER_ITEM = 64
+
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self._cells = {} # (column, row) -> set of items
+        self._item_cells = {} # item -> (min column, min row, max column, max row), or None for large items
+        self._large_items = set()
+
+    def __len__(self):
+        return len(self._item_cells)
+
+    def __contains__(self, item):
+        return item in self._item_cells
+
+    def _cell_range(self, left, bottom, right, top):
+        try:
+            cell_range = (int(left // self.cell_size), int(bottom // self.cell_size),
+                          int(right // self.cell_size), int(top // self.cell_size))
+        except (ValueError, OverflowError):
+            return None
+        if (cell_range[2] - cell_range[0] + 1) * (cell_range[3] - cell_range[1] + 1) > self.MAX_CELLS_PER_ITEM:
+            return None
+        return cell_range
+
+    def insert(self, item, left, bottom, right, top):
+        if item in self._item_cells:
+            self.move(item, left, bottom, right, top)
+            return
+        cell_range = self._cell_range(left, bottom, right, top)
+        self._item_cells[item] = cell_range
+        self._add_to_cells(item, cell_range)
+
+    def move(self, item, left, bottom, right, top):
+        """
+        Update an item's bounding box. Does nothing if the item isn't in the grid.
+        """
+        try:
+            old_range = self._item_cells[item]
+        except KeyError:
+            return
+        cell_range = self._cell_range(left, bottom, right, top)
+        if cell_range == old_range and cell_range is not None:
+            return
+        self._remove_from_cells(item, old_range)
+        self._item_cells[item] = cell_range
+        self._add_to_cells(item, cell_range)
+
+    def remove(self, item):
+        try:
+            cell_range = self._item_cells.pop(item)
+        except KeyError:
+            return
+        self._remove_from_cells(item, cell_range)
+
+    def query(self, left, bottom, right, top):
+        """
+        Returns a set of the items whose cells overlap the given rectangle. Some of them
+        might not actually overlap it, so callers should still check each item.
+        """
+        found = set(self._large_items)
+        try:
+            min_column, min_row = int(left // self.cell_size), int(bottom // self.cell_size)
+            max_column, max_row = int(right // self.cell_size), int(top // self.cell_size)
+        except (ValueError, OverflowError):
+            found.update(self._item_cells)
+            return found
+        cells = self._cells
+        if (max_column - min_column + 1) * (max_row - min_row + 1) > len(cells):
+            # big areas (like the whole screen) cover more cells than have anything in
+            # them, so it's quicker to check every cell that isn't empty
+            for (column, row), items in cells.items():
+                if min_column <= column <= max_column and min_row <= row <= max_row:
+                    found.update(items)
+            return found
+        for column in range(min_column, max_column + 1):
+            for row in range(min_row, max_row + 1):
+                items = cells.get((column, row))
+                if items:
+                    found.update(items)
+        return found
+
+    def query_point(self, x, y):
+        found = set(self._large_items)
+        items = self._cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if items:
+            found.update(items)
+        return found
+
+    def _add_to_cells(self, item, cell_range):
+        if cell_range is None:
+            self._large_items.add(item)
+            return
+        cells = self._cells
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                items = cells.get((column, row))
+                if items is None:
+                    items = cells[(column, row)] = set()
+                items.add(item)
+
+    def _remove_from_cells(self, item, cell_range):
+        if cell_range is None:
+            self._large_items.discard(item)
+            return
+        cells = self._cells
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                items = cells.get((column, row))
+                if items is not None:
+                    items.discard(item)
+                    if not items:
+                        del cells[(column, row)]